@@ -0,0 +1,100 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Campbell 数据采集器 TOA5 文本格式读取
+# 文件前 4 行依次为：文件信息（站名、型号、程序、数据表）、字段名、单位、处理方式，其后为数据行。
+# 按字段单位确定列类型（TS 为时间戳、RN 为记录号、其余为浮点数），
+# 以固定行数分块流式读取，内存与文件大小无关。
+
+HEADER_ROWS = 4
+TIMESTAMP_FIELD = "TIMESTAMP"
+# 文件信息行各字段
+INFO_FIELDS = "格式 站名 型号 序列号 系统版本 程序 程序签名 数据表".split()
+# keep_default_na=False，需列出全部缺测标记；空字段出现在截断或未写完的行中
+NA_VALUES = ["NAN", "INF", "-INF", "NaN", ""]
+
+
+def read_toa5_header(file_path):
+    """读取 TOA5 文件头，返回 (文件信息, [(字段名, 单位, 处理方式), ...])"""
+    with open(file_path, newline="", encoding="utf-8", errors="replace") as f:
+        rows = [next(csv.reader(f)) for _ in range(HEADER_ROWS)]
+    if not rows[0] or rows[0][0] != "TOA5":
+        raise ValueError(f"不是 TOA5 格式文件：{file_path}")
+
+    info = dict(zip(INFO_FIELDS, rows[0]))
+    fields = list(zip(rows[1], rows[2], rows[3]))
+    return info, fields
+
+
+def field_dtypes(fields):
+    """按单位确定各字段的读取类型（时间戳先按字符串读取，再统一解析）"""
+    dtypes = {}
+    for name, unit, _ in fields:
+        if name == TIMESTAMP_FIELD or unit == "TS":
+            dtypes[name] = str
+        elif unit == "RN":
+            dtypes[name] = "Int64"  # 可空整数，截断行的记录号可能为空
+        else:
+            dtypes[name] = np.float64
+    return dtypes
+
+
+def iter_toa5_chunks(file_path, usecols=None, rename=None, chunksize=200_000):
+    """分块读取 TOA5 文件，逐块返回带类型的 DataFrame
+
+    usecols 为需要的 TOA5 字段名（默认全部）；rename 为 {字段名: 新列名}，
+    时间戳列解析为 datetime64，默认重命名为 “时间”。
+    """
+    _, fields = read_toa5_header(file_path)
+    dtypes = field_dtypes(fields)
+    names = [name for name, _, _ in fields]
+    if usecols is not None:
+        missing = set(usecols) - set(names)
+        if missing:
+            raise KeyError(f"TOA5 文件中不存在字段：{sorted(missing)}")
+        names = [name for name in names if name in usecols or name == TIMESTAMP_FIELD]
+    rename = {TIMESTAMP_FIELD: "时间", **(rename or {})}
+
+    reader = pd.read_csv(
+        file_path,
+        skiprows=[0, 2, 3],
+        header=0,
+        usecols=names,
+        dtype={name: dtypes[name] for name in names},
+        na_values=NA_VALUES,
+        keep_default_na=False,
+        chunksize=chunksize,
+        encoding="utf-8",
+        encoding_errors="replace",
+    )
+    for chunk in reader:
+        chunk[TIMESTAMP_FIELD] = pd.to_datetime(
+            chunk[TIMESTAMP_FIELD], format="ISO8601"
+        )
+        # 时间戳缺失的行无法归入时间区间，直接丢弃
+        chunk = chunk.dropna(subset=[TIMESTAMP_FIELD])
+        yield chunk.rename(columns=rename)
+
+
+def iter_toa5_files(file_paths, **kwargs):
+    """按文件名顺序依次分块读取多个 TOA5 文件
+
+    下游按时间有序处理，文件之间时间重叠或顺序颠倒时报错，而不是静默得到错误结果。
+    """
+    time_col = {TIMESTAMP_FIELD: "时间", **(kwargs.get("rename") or {})}
+    time_col = time_col[TIMESTAMP_FIELD]
+    last_time, last_file = None, None
+    for file_path in sorted(Path(p) for p in file_paths):
+        for chunk in iter_toa5_chunks(file_path, **kwargs):
+            if chunk.empty:
+                continue
+            if last_time is not None and chunk[time_col].iloc[0] <= last_time:
+                raise ValueError(
+                    f"{file_path.name} 的时间 {chunk[time_col].iloc[0]} 不晚于"
+                    f" {last_file.name} 的 {last_time}，文件时间重叠或顺序错误"
+                )
+            last_time, last_file = chunk[time_col].iloc[-1], file_path
+            yield chunk
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from 时间缺口 import freq_step
+
+# 分块流式重采样
+# 输入为按时间排序的数据块迭代器，每块用 reduceat 按时间区间求部分统计量
+# （计数、均值、离差平方和、最小、最大、最后一个有效值）；
+# 每块最后一个区间可能尚未结束，保留到下一块合并，其余区间直接输出。
+# 内存只与块大小有关，结果与对整个序列 resample(freq).agg(...) 相同（包括空区间）。
+# 区间按 freq 对齐（与 Series.dt.floor 相同）。
+
+AGGREGATIONS = ("mean", "min", "max", "std", "count", "last")
+
+
+def _bin_stats(values, starts, aggs):
+    """按区间起点序号求部分统计量，values 为 (行, 通道) 数组
+
+    计数和均值总是计算（合并区间时需要），其余统计量只在 aggs 需要时计算。
+    """
+    valid = ~np.isnan(values)
+    has_nan = not valid.all()
+    count = np.add.reduceat(valid, starts, axis=0).astype(float)
+    filled = np.where(valid, values, 0.0) if has_nan else values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats = {
+            "count": count,
+            "mean": np.add.reduceat(filled, starts, axis=0) / count,
+        }
+
+    if "std" in aggs:
+        # 离差平方和（相对区间均值），用于合并时计算标准差
+        lengths = np.diff(np.append(starts, len(values)))
+        deviation = values - np.repeat(stats["mean"], lengths, axis=0)
+        if has_nan:
+            deviation[~valid] = 0.0
+        stats["m2"] = np.add.reduceat(deviation**2, starts, axis=0)
+    if "min" in aggs:
+        stats["min"] = np.fmin.reduceat(values, starts, axis=0)
+    if "max" in aggs:
+        stats["max"] = np.fmax.reduceat(values, starts, axis=0)
+    if "last" in aggs:
+        # 最后一个有效值
+        last_row = np.append(starts[1:], len(values)) - 1
+        stats["last"] = values[last_row]
+        if has_nan:
+            rows = np.where(valid, np.arange(len(values))[:, None], -1)
+            last_row = np.maximum.reduceat(rows, starts, axis=0)
+            stats["last"] = np.where(
+                last_row >= 0,
+                np.take_along_axis(values, np.maximum(last_row, 0), axis=0),
+                np.nan,
+            )
+    return stats
+
+
+def _merge_first(stats, carry):
+    """把上一块遗留区间的统计量合并到本块第一个区间（Chan 合并公式）"""
+    n_a, n_b = carry["count"][0], stats["count"][0]
+    n = n_a + n_b
+    mean_a = np.nan_to_num(carry["mean"][0])
+    mean_b = np.nan_to_num(stats["mean"][0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = mean_b - mean_a
+        stats["mean"][0] = np.where(n > 0, mean_a + delta * n_b / n, np.nan)
+        if "m2" in stats:
+            m2 = carry["m2"][0] + stats["m2"][0] + delta**2 * n_a * n_b / n
+            stats["m2"][0] = np.nan_to_num(m2)
+    stats["count"][0] = n
+    if "min" in stats:
+        stats["min"][0] = np.fmin(carry["min"][0], stats["min"][0])
+    if "max" in stats:
+        stats["max"][0] = np.fmax(carry["max"][0], stats["max"][0])
+    if "last" in stats:
+        stats["last"][0] = np.where(
+            np.isnan(stats["last"][0]), carry["last"][0], stats["last"][0]
+        )
+
+
+def _finish(labels, stats, columns, aggs, start, step, time_col):
+    """由统计量生成结果表，并补齐 start 之后的空区间
+
+    只有一种统计量时列名保持原名，否则为 “列名_统计量”。
+    """
+    results = dict(stats)
+    if "std" in aggs:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(stats["m2"] / (stats["count"] - 1))
+        results["std"] = np.where(stats["count"] > 1, std, np.nan)
+
+    data = {}
+    for col_idx, col in enumerate(columns):
+        for agg in aggs:
+            name = col if len(aggs) == 1 else f"{col}_{agg}"
+            data[name] = results[agg][:, col_idx]
+    frame = pd.DataFrame(data, index=labels)
+
+    full = pd.date_range(start, labels[-1], freq=step, name=time_col)
+    frame = frame.reindex(full)
+    count_cols = [
+        c for c in frame.columns if c.endswith("_count") or aggs == ("count",)
+    ]
+    frame[count_cols] = frame[count_cols].fillna(0)
+    return frame.reset_index()
+
+
+def resample_chunks(chunks, freq="min", time_col="时间", aggs=("mean",)):
+    """对时间有序的数据块流式重采样，逐批返回已完成区间的 DataFrame
+
+    aggs 可选 mean / min / max / std / count / last，一次遍历同时计算。
+    """
+    aggs = tuple(aggs)
+    unknown = set(aggs) - set(AGGREGATIONS)
+    if unknown:
+        raise ValueError(f"不支持的统计量：{sorted(unknown)}，可选 {AGGREGATIONS}")
+
+    step = freq_step(freq)
+    columns = None
+    carry = None  # 尚未结束的最后一个区间：(区间标签, 统计量)
+    next_label = None  # 下一个应输出的区间起点，用于补齐空区间
+
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if columns is None:
+            columns = list(chunk.columns.drop(time_col))
+
+        times = pd.DatetimeIndex(chunk[time_col]).as_unit("ns")
+        ticks = times.asi8 // step.value
+        starts = np.flatnonzero(np.diff(ticks, prepend=ticks[0] - 1))
+        labels = pd.DatetimeIndex(ticks[starts] * step.value).as_unit("ns")
+        stats = _bin_stats(chunk[columns].to_numpy(dtype=float), starts, aggs)
+
+        if carry is not None:
+            if labels[0] == carry[0][0]:
+                _merge_first(stats, carry[1])
+            else:
+                labels = carry[0].append(labels)
+                stats = {k: np.concatenate([carry[1][k], v]) for k, v in stats.items()}
+        if next_label is None:
+            next_label = labels[0]
+
+        carry = (labels[-1:], {k: v[-1:] for k, v in stats.items()})
+        if len(labels) > 1:
+            done = {k: v[:-1] for k, v in stats.items()}
+            yield _finish(labels[:-1], done, columns, aggs, next_label, step, time_col)
+            next_label = labels[-2] + step
+
+    if carry is not None:
+        yield _finish(carry[0], carry[1], columns, aggs, next_label, step, time_col)
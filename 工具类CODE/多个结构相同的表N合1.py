@@ -1,5 +1,8 @@
 import pandas as pd
 import os
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import Workbook
 
 # 定义文件夹路径和输出文件夹
 input_directory = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据"
@@ -7,41 +10,76 @@ output_directory = (
     r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据"
 )
 
-# 确保输出文件夹存在，如果不存在则创建
-os.makedirs(output_directory, exist_ok=True)
-
 # 定义输出文件名
 output_file = os.path.join(output_directory, "锦州阳光_电量_全30日数据(每分钟).xlsx")
 
-# 定义要提取的列名
+# 定义要提取的列名（第一列为时间列，用于排序和去重）
 columns_to_extract = [
     "时间 ()",
     "电量 (V)",
 ]
 
+max_workers = None  # 并行读取的进程数，None 表示使用全部CPU核心
+
+
 # ========================================================
-# 创建一个空的 DataFrame 用于存储合并的数据
-merged_data = pd.DataFrame()
-
-# 遍历目录下的所有 Excel 文件
-for file in os.listdir(input_directory):
-    if file.endswith(".xls"):  # 确保是 Excel 文件
-        print(file)
-        file_path = os.path.join(input_directory, file)  # 构建完整的文件路径
-
-        # 读取 Excel 文件
-        try:
-            data = pd.read_excel(file_path)
-            # 提取指定的列
-
-            extracted_data = data[columns_to_extract]
-            # 将提取的数据添加到合并 DataFrame
-            merged_data = pd.concat([merged_data, extracted_data], ignore_index=True)
-        except Exception as e:
-            print(f"读取文件 {file} 时发生错误: {e}")
-
-# 将合并后的数据输出到新的 Excel 文件
-print("正在合并...")
-merged_data.to_excel(output_file, index=False)
-
-print(f"数据已成功合并并输出到 {output_file}")
+def read_extracted(file_path):
+    """子进程中读取单个文件的指定列，并按时间排序、去重"""
+    data = pd.read_excel(file_path, usecols=columns_to_extract)
+    data = data[columns_to_extract]
+
+    # 解析时间作为排序键，原始时间值保持不变写出
+    time_key = pd.to_datetime(data[columns_to_extract[0]], errors="coerce")
+    data = data.assign(_key=time_key).dropna(subset=["_key"])
+    data = data.sort_values("_key", kind="stable").drop_duplicates("_key")
+    return data
+
+
+def iter_rows(data):
+    """按 (时间键, 行值) 逐行产出，供多路归并使用"""
+    keys = data["_key"].to_numpy()
+    values = data[columns_to_extract].itertuples(index=False, name=None)
+    return zip(keys, values)
+
+
+def merge_files():
+    # 确保输出文件夹存在，如果不存在则创建
+    os.makedirs(output_directory, exist_ok=True)
+
+    # 遍历目录下的所有 Excel 文件
+    files = sorted(f for f in os.listdir(input_directory) if f.endswith(".xls"))
+    file_paths = [os.path.join(input_directory, f) for f in files]
+
+    # 多进程并行读取，每个文件只读取需要的列
+    extracted = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(read_extracted, path) for path in file_paths]
+        for file, future in zip(files, futures):
+            try:
+                extracted.append(future.result())
+                print(file)
+            except Exception as e:
+                print(f"读取文件 {file} 时发生错误: {e}")
+
+    # 多路归并：各文件已内部有序，按时间流式合并并跳过重复时间
+    print("正在合并...")
+    workbook = Workbook(write_only=True)  # 只写模式，内存占用与行数无关
+    sheet = workbook.create_sheet()
+    sheet.append(columns_to_extract)
+
+    rows_written = 0
+    last_key = None
+    merged = heapq.merge(*(iter_rows(d) for d in extracted), key=lambda r: r[0])
+    for key, values in merged:
+        if key == last_key:
+            continue
+        sheet.append([None if pd.isna(v) else v for v in values])
+        last_key = key
+        rows_written += 1
+
+    workbook.save(output_file)
+    print(f"数据已成功合并并输出到 {output_file}（共 {rows_written} 行）")
+
+
+if __name__ == "__main__":
+    merge_files()
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from 时间缺口 import freq_step
+
+# 多平台数据合并引擎
+# 各数据源先按各自的时钟偏差校正时间，再在公共分钟网格上做有序 as-of 匹配
+# （取容差范围内最近的观测）。网格按块推进，每个数据源只缓存当前块附近的数据，
+# 数据源以时间有序的数据块迭代器流式读取，内存与总时长无关。
+
+
+def apply_clock_offset(times, offset):
+    """时钟校正：校正后时间 = 记录时间 + 偏差
+
+    offset 可为固定偏差（Timedelta 或字符串），也可为以时间为索引的偏差序列
+    （如每日估计的偏差），此时按时间线性插值，可同时校正偏差和漂移。
+    """
+    times = pd.DatetimeIndex(times).as_unit("ns")
+    if offset is None:
+        return times
+    if isinstance(offset, pd.Series):
+        knots = pd.DatetimeIndex(offset.index).as_unit("ns").asi8
+        shift = np.interp(
+            times.asi8.astype(float),
+            knots.astype(float),
+            pd.to_timedelta(offset).to_numpy().astype("timedelta64[ns]").astype(float),
+        )
+        return times + pd.to_timedelta(shift.round().astype(np.int64), unit="ns")
+    return times + pd.Timedelta(offset)
+
+
+class _SourceBuffer:
+    """单个数据源的读取状态：只保留当前网格块附近、已校正时间的数据"""
+
+    def __init__(self, source):
+        self.name = source["name"]
+        self.chunks = iter(source["chunks"])
+        self.time_col = source.get("time_col", "时间")
+        self.columns = source.get("columns")  # {原列名: 输出列名}
+        self.tolerance = pd.Timedelta(source.get("tolerance", "30s"))
+        self.offset = source.get("offset")
+        self.output_columns = (
+            None if self.columns is None else list(self.columns.values())
+        )
+        self.buffer = None
+        self.exhausted = False
+        self.last_seen = None  # 已读取的最后一个校正后时间
+
+    def _prepare(self, chunk):
+        times = apply_clock_offset(pd.to_datetime(chunk[self.time_col]), self.offset)
+        columns = self.columns or {c: c for c in chunk.columns if c != self.time_col}
+        data = chunk[list(columns)].rename(columns=columns).reset_index(drop=True)
+        data = data.apply(pd.to_numeric, errors="coerce")
+        data.insert(0, "_时间", times)
+        self.output_columns = list(columns.values())
+        return data.dropna(subset=["_时间"])
+
+    def first_time(self):
+        """数据源的第一个时间（读取首个非空数据块）"""
+        self.fill_until(None)
+        return (
+            None
+            if self.buffer is None or self.buffer.empty
+            else self.buffer["_时间"].iloc[0]
+        )
+
+    def fill_until(self, until):
+        """继续读取，直到缓存覆盖 until（None 表示至少读取一块）"""
+        while not self.exhausted and (
+            self.buffer is None
+            or self.buffer.empty
+            or (until is not None and self.buffer["_时间"].iloc[-1] < until)
+        ):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                break
+            if chunk.empty:
+                continue
+            part = self._prepare(chunk)
+            if not part.empty:
+                self.last_seen = part["_时间"].iloc[-1]
+            self.buffer = (
+                part
+                if self.buffer is None
+                else pd.concat([self.buffer, part], ignore_index=True)
+            )
+            if until is None:
+                break
+
+    def match(self, grid):
+        """对网格块做有序 as-of 匹配，并丢弃之后不再需要的数据"""
+        end = grid["_时间"].iloc[-1]
+        self.fill_until(end + self.tolerance)
+        if self.buffer is None or self.buffer.empty:
+            if self.output_columns is None:
+                return None
+            return pd.DataFrame(np.nan, index=grid.index, columns=self.output_columns)
+        # 校正后的时间可能因重复记录而相同，保留首条
+        right = self.buffer.drop_duplicates("_时间").sort_values("_时间", kind="stable")
+        matched = pd.merge_asof(
+            grid,
+            right,
+            on="_时间",
+            direction="nearest",
+            tolerance=self.tolerance,
+        )
+        self.buffer = self.buffer[self.buffer["_时间"] >= end - self.tolerance]
+        return matched.drop(columns="_时间")
+
+
+def iter_joined_blocks(sources, freq="min", start=None, end=None, block_size=10_000):
+    """将多个数据源合并到公共时间网格，逐块返回 (时间 + 各数据源列) 的表
+
+    sources 为字典列表，每项包含：
+      name       数据源名称
+      chunks     时间有序的数据块迭代器
+      time_col   时间列名（默认 "时间"）
+      columns    {原列名: 输出列名}，默认使用全部列
+      tolerance  as-of 匹配的最大时间差（默认 30 秒）
+      offset     时钟偏差，见 apply_clock_offset
+    start / end 默认取各数据源校正后时间的范围。
+    """
+    step = freq_step(freq)
+    buffers = [_SourceBuffer(source) for source in sources]
+
+    if start is None:
+        firsts = [t for t in (b.first_time() for b in buffers) if t is not None]
+        if not firsts:
+            return
+        start = min(firsts).floor(freq)
+    start = pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+
+    block_start = start
+    while True:
+        grid_times = pd.date_range(block_start, periods=block_size, freq=step)
+        grid_times = grid_times.as_unit("ns")
+        if end is not None:
+            grid_times = grid_times[grid_times <= end]
+        else:
+            # 先读到本块末尾，全部数据源读完后网格只延伸到最后观测的容差范围内
+            for buffer in buffers:
+                buffer.fill_until(grid_times[-1] + buffer.tolerance)
+            if all(b.exhausted for b in buffers):
+                seen = [
+                    b.last_seen + b.tolerance
+                    for b in buffers
+                    if b.last_seen is not None
+                ]
+                if not seen:
+                    return
+                grid_times = grid_times[grid_times <= max(seen)]
+        if len(grid_times) == 0:
+            return
+
+        grid = pd.DataFrame({"_时间": grid_times})
+        block = [pd.DataFrame({"时间": grid_times})]
+        for buffer in buffers:
+            matched = buffer.match(grid)
+            if matched is not None:
+                block.append(matched)
+        yield pd.concat(block, axis=1)
+        block_start = grid_times[-1] + step
+
+
+def join_sources(sources, freq="min", start=None, end=None, block_size=10_000):
+    """合并全部数据源并返回一张表（列顺序与数据源顺序一致）"""
+    blocks = list(iter_joined_blocks(sources, freq, start, end, block_size))
+    if not blocks:
+        return pd.DataFrame(columns=["时间"])
+    return pd.concat(blocks, ignore_index=True)
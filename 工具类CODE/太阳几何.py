@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+
+# 太阳几何计算（NOAA 太阳位置近似公式，精度约 1 分钟）
+# 对整个时间索引向量化计算太阳高度角，以及每天的日出、日落时间，
+# 可用于绘图中的昼夜底色和晴空辐射、昼夜划分等分析。
+
+# 兴凯湖观测站位置
+LATITUDE = 45.2  # 北纬 (°)
+LONGITUDE = 132.5  # 东经 (°)
+UTC_OFFSET = 8  # 数据时间所在时区（北京时间）
+
+SUNRISE_ZENITH = 90.833  # 日出日落天顶角：含大气折射和太阳视半径 (°)
+
+
+def _solar_terms(times, utc_offset=UTC_OFFSET):
+    """返回 (赤纬, 时差) ，赤纬为弧度，时差为分钟"""
+    times = pd.DatetimeIndex(times)
+    utc_hours = (
+        times.hour + times.minute / 60 + times.second / 3600 - utc_offset
+    ).to_numpy(dtype=float)
+    days_in_year = np.where(times.is_leap_year, 366, 365)
+    gamma = (
+        2
+        * np.pi
+        / days_in_year
+        * (times.dayofyear.to_numpy() - 1 + (utc_hours - 12) / 24)
+    )
+
+    eqtime = 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(gamma)
+        - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma)
+        - 0.040849 * np.sin(2 * gamma)
+    )
+    decl = (
+        0.006918
+        - 0.399912 * np.cos(gamma)
+        + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma)
+        + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma)
+        + 0.00148 * np.sin(3 * gamma)
+    )
+    return decl, eqtime
+
+
+def solar_elevation(
+    times, latitude=LATITUDE, longitude=LONGITUDE, utc_offset=UTC_OFFSET
+):
+    """计算每个时间点的太阳高度角 (°)，times 为当地时间"""
+    times = pd.DatetimeIndex(times)
+    decl, eqtime = _solar_terms(times, utc_offset)
+
+    # 真太阳时 (分钟) 与时角
+    local_minutes = (times.hour * 60 + times.minute + times.second / 60).to_numpy(
+        dtype=float
+    )
+    true_solar = local_minutes + eqtime + 4 * longitude - 60 * utc_offset
+    hour_angle = np.radians(true_solar / 4 - 180)
+
+    lat = np.radians(latitude)
+    cos_zenith = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(
+        hour_angle
+    )
+    return 90 - np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+
+
+def sunrise_sunset(
+    dates, latitude=LATITUDE, longitude=LONGITUDE, utc_offset=UTC_OFFSET
+):
+    """计算每天的日出、日落时间（当地时间），返回以日期为索引的 DataFrame
+
+    极昼、极夜的日期没有日出日落，对应值为 NaT。
+    """
+    days = pd.DatetimeIndex(dates).normalize().unique()
+    decl, eqtime = _solar_terms(days + pd.Timedelta(hours=12), utc_offset)
+
+    lat = np.radians(latitude)
+    cos_ha = np.cos(np.radians(SUNRISE_ZENITH)) / (np.cos(lat) * np.cos(decl)) - np.tan(
+        lat
+    ) * np.tan(decl)
+    with np.errstate(invalid="ignore"):
+        ha = np.degrees(np.arccos(np.where(np.abs(cos_ha) <= 1, cos_ha, np.nan)))
+
+    # 太阳正午（当地时间，分钟）
+    noon = 720 - 4 * longitude - eqtime + 60 * utc_offset
+    return pd.DataFrame(
+        {
+            "日出": days + pd.to_timedelta(noon - 4 * ha, unit="min"),
+            "日落": days + pd.to_timedelta(noon + 4 * ha, unit="min"),
+        },
+        index=days,
+    )
+
+
+def is_daytime(times, min_elevation=0.0, **kwargs):
+    """太阳高度角高于 min_elevation 的时间点为白天"""
+    return solar_elevation(times, **kwargs) > min_elevation
+
+
+def add_daylight(ax, start, end, facecolor="gold", alpha=0.06, zorder=0, **kwargs):
+    """在坐标轴上用一个 PolyCollection 绘制 start~end 之间每天日出到日落的底色"""
+    spans = sunrise_sunset(pd.date_range(start, end, freq="D")).dropna()
+    x0 = mdates.date2num(spans["日出"].to_numpy())
+    x1 = mdates.date2num(spans["日落"].to_numpy())
+
+    # x 为数据坐标，y 为坐标轴比例坐标，底色始终占满整个高度
+    verts = [[(a, 0), (a, 1), (b, 1), (b, 0)] for a, b in zip(x0, x1)]
+    collection = PolyCollection(
+        verts,
+        facecolors=facecolor,
+        edgecolors="none",
+        alpha=alpha,
+        zorder=zorder,
+        transform=ax.get_xaxis_transform(),
+        **kwargs,
+    )
+    ax.add_collection(collection, autolim=False)
+    return collection
@@ -0,0 +1,29 @@
+from concurrent.futures import ProcessPoolExecutor
+
+# 批量文件处理执行器
+# 各文件之间相互独立，分发到进程池并行处理；
+# 每个文件的日志与失败信息在子进程中收集，最后按输入顺序合并，保证报告顺序固定。
+
+
+def _run_one(worker, item, args):
+    """子进程入口：捕获异常，统一返回 (结果, 错误信息)"""
+    try:
+        return worker(item, *args), None
+    except Exception as e:
+        return None, str(e)
+
+
+def run_batch(worker, items, *args, max_workers=None):
+    """并行执行 worker(item, *args)，按 items 顺序返回 [(item, 结果, 错误信息), ...]
+
+    worker 必须是模块级函数（可被子进程导入）；max_workers=1 时在当前进程串行执行，便于调试。
+    """
+    items = list(items)
+    if max_workers == 1 or len(items) <= 1:
+        outcomes = [_run_one(worker, item, args) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_one, worker, item, args) for item in items]
+            outcomes = [future.result() for future in futures]
+
+    return [(item, result, error) for item, (result, error) in zip(items, outcomes)]
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+
+# 按像素降采样的折线渲染
+# 把时间轴按输出像素宽度分桶，每桶只保留首点、末点、最小值、最大值（min/max 包络），
+# 或用 LTTB（Largest-Triangle-Three-Buckets）选点，再用一个 LineCollection 绘制。
+# 包络保留每个像素列内的全部极值，绘图结果与绘制全部点在视觉上一致。
+# 与 sns.lineplot 相同，缺测点被剔除，前后的观测值直接相连。
+
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+
+
+def _buckets(x, n_buckets):
+    """按 x 等宽分桶，返回每个桶的 (起点, 终点) 序号（x 已排序）"""
+    span = x[-1] - x[0]
+    if span <= 0:
+        ids = np.zeros(len(x), dtype=np.int64)
+    else:
+        ids = np.minimum(
+            ((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1
+        )
+    starts = np.flatnonzero(np.diff(ids, prepend=-1))
+    ends = np.append(starts[1:], len(x)) - 1
+    return ids, starts, ends
+
+
+def minmax_envelope(x, y, n_buckets):
+    """min/max 包络降采样：每桶保留首、末、最小、最大四个点，返回选中点的序号"""
+    if len(x) <= 4 * n_buckets:
+        return np.arange(len(x))
+    ids, starts, ends = _buckets(x, n_buckets)
+    # 先按桶、再按数值排序，每桶的第一个和最后一个即为最小值和最大值
+    order = np.lexsort((y, ids))
+    return np.unique(np.concatenate([starts, ends, order[starts], order[ends]]))
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 降采样，返回选中点的序号"""
+    if n_out >= len(x) or n_out < 3:
+        return np.arange(len(x))
+
+    # 首末点固定，中间点分为 n_out - 2 个桶
+    edges = np.linspace(1, len(x) - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, len(x) - 1
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 下一个桶的平均点（最后一个桶取末点）
+        if i + 2 < len(edges):
+            nxt = slice(hi, edges[i + 2])
+            next_x, next_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        prev = selected[i]
+        area = np.abs(
+            (x[prev] - next_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (next_y - y[prev])
+        )
+        selected[i + 1] = lo + np.argmax(area)
+    return selected
+
+
+def downsample_line(x, y, n_buckets, method="minmax"):
+    """按 n_buckets 个像素列降采样，返回 (x, y)"""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"不支持的降采样方式：{method}，可选 {DOWNSAMPLE_METHODS}")
+    if method == "minmax":
+        idx = minmax_envelope(x, y, n_buckets)
+    else:
+        idx = lttb(x, y, 2 * n_buckets)
+    return x[idx], y[idx]
+
+
+def render_line(ax, series, color, linewidth, alpha=1.0, method="minmax", **kwargs):
+    """按坐标轴像素宽度降采样后绘制时间序列折线，返回 LineCollection"""
+    series = series.dropna().sort_index()
+    x = mdates.date2num(pd.DatetimeIndex(series.index).to_numpy())
+    y = series.to_numpy(dtype=float)
+
+    width_px = max(1, int(ax.bbox.width))
+    if len(x):
+        x, y = downsample_line(x, y, width_px, method)
+
+    line = LineCollection(
+        [np.column_stack([x, y])],
+        colors=color,
+        linewidths=linewidth,
+        alpha=alpha,
+        **kwargs,
+    )
+    ax.xaxis_date()
+    ax.add_collection(line)
+    ax.autoscale_view()
+    return line
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from 时间缺口 import freq_step
+
+# 数据采集器时钟偏差估计
+# 两台采集器的通道先对齐到同一分钟网格并做一阶差分（突出短时变化、去掉缓慢趋势），
+# 再按滑动窗口做基于 FFT 的互相关：全部窗口 × 全部通道对组成一个三维数组，
+# 一次 rfft 求出所有互相关，取峰值所在的滞后（抛物线插值到亚采样精度）。
+# 每日取有效窗口的中位数作为当日偏差，并线性拟合得到漂移。
+# 注意：两个通道之间若存在物理滞后（如不同深度的热传导），会一并计入偏差，
+# 应尽量选择同一位置或响应同步的通道对。
+
+
+def _normalize_windows(windows, min_valid):
+    """窗口去均值、缺测置零，并缩放为单位能量；有效点比例不足的窗口整体置零
+
+    返回 (处理后的窗口, 是否有效)
+    """
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=-1, keepdims=True)
+    enough = counts[..., 0] >= min_valid * windows.shape[-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=-1, keepdims=True) / counts
+    centered = np.where(valid & enough[..., None], windows - mean, 0.0)
+    energy = np.sqrt((centered**2).sum(axis=-1, keepdims=True))
+    usable = enough & (energy[..., 0] > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(usable[..., None], centered / energy, 0.0), usable
+
+
+def cross_correlate(a, b, max_lag):
+    """对最后一维做 FFT 互相关，a、b 形状相同（..., 窗口长度）
+
+    返回 (峰值滞后, 峰值相关系数)，滞后以采样点计，正值表示 b 比 a 晚；
+    峰值落在 ±max_lag 边界上时视为超出搜索范围，返回 NaN。
+    """
+    length = a.shape[-1]
+    n_fft = 1 << int(np.ceil(np.log2(2 * length - 1)))
+    spectrum = np.conj(np.fft.rfft(a, n_fft)) * np.fft.rfft(b, n_fft)
+    cc = np.fft.irfft(spectrum, n_fft)
+    # 负滞后在末尾，拼接为 -max_lag … +max_lag
+    cc = np.concatenate([cc[..., -max_lag:], cc[..., : max_lag + 1]], axis=-1)
+
+    peak = np.argmax(cc, axis=-1)
+    inner = (peak > 0) & (peak < 2 * max_lag)
+    index = np.clip(peak, 1, 2 * max_lag - 1)[..., None]
+    left, centre, right = (
+        np.take_along_axis(cc, index + k, axis=-1)[..., 0] for k in (-1, 0, 1)
+    )
+    # 抛物线插值修正峰值位置
+    curvature = left - 2 * centre + right
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shift = np.where(curvature < 0, 0.5 * (left - right) / curvature, 0.0)
+    lags = np.where(inner, index[..., 0] - max_lag + shift, np.nan)
+    return lags, np.take_along_axis(cc, peak[..., None], axis=-1)[..., 0]
+
+
+def window_offsets(
+    ref,
+    other,
+    pairs,
+    freq="min",
+    window="6h",
+    step="1h",
+    max_lag="30min",
+    min_valid=0.8,
+):
+    """滑动窗口估计各通道对的时间偏差
+
+    ref、other 为同一时间网格（间隔 freq）上、以时间为索引的表，
+    pairs 为 [(ref 列, other 列), ...]。
+    返回每个 (窗口, 通道对) 一行的表：窗口中心、通道对、偏差(秒)、相关系数，
+    偏差为 other 时间需要加上的量（即 “校正后时间 - 记录时间”）。
+    """
+    sample = freq_step(freq)
+    length = int(freq_step(window) / sample)
+    stride = max(int(freq_step(step) / sample), 1)
+    max_lag = int(freq_step(max_lag) / sample)
+    if length < 2 * max_lag + 2:
+        raise ValueError(f"窗口 {window} 过短，至少应为最大滞后 {max_lag} 点的两倍")
+
+    times = pd.DatetimeIndex(ref.index)
+    a = np.diff(ref[[p[0] for p in pairs]].to_numpy(float), axis=0)
+    b = np.diff(other[[p[1] for p in pairs]].to_numpy(float), axis=0)
+    if len(a) < length:
+        return pd.DataFrame(columns=["窗口中心", "通道对", "偏差(秒)", "相关系数"])
+
+    # (窗口, 通道对, 窗口长度)
+    a, a_ok = _normalize_windows(
+        sliding_window_view(a, length, axis=0)[::stride], min_valid
+    )
+    b, b_ok = _normalize_windows(
+        sliding_window_view(b, length, axis=0)[::stride], min_valid
+    )
+    lags, corr = cross_correlate(a, b, max_lag)
+    lags[~(a_ok & b_ok)] = np.nan
+
+    starts = np.arange(len(lags)) * stride
+    centres = times[1:][starts + length // 2]
+    names = [f"{p[0]} ~ {p[1]}" for p in pairs]
+    return pd.DataFrame(
+        {
+            "窗口中心": np.repeat(centres, len(pairs)),
+            "通道对": np.tile(names, len(lags)),
+            # b 比 a 晚 lag 个采样点，other 的时间需提前 lag
+            "偏差(秒)": (-lags * sample.total_seconds()).ravel(),
+            "相关系数": corr.ravel(),
+        }
+    )
+
+
+def daily_offsets(windows, min_corr=0.3):
+    """按日汇总窗口估计：当日有效窗口偏差的中位数，以及全时段的线性漂移
+
+    返回 (每日表, 漂移(秒/天))；每日表列为 日期、偏差(秒)、线性拟合偏差(秒)、
+    相关系数、有效窗口数，无有效窗口的日期不输出。
+    """
+    valid = windows[windows["偏差(秒)"].notna() & (windows["相关系数"] >= min_corr)]
+    days = pd.DatetimeIndex(valid["窗口中心"]).normalize()
+    daily = (
+        valid.groupby(days)
+        .agg(
+            **{
+                "偏差(秒)": ("偏差(秒)", "median"),
+                "相关系数": ("相关系数", "median"),
+                "有效窗口数": ("偏差(秒)", "size"),
+            }
+        )
+        .rename_axis("日期")
+        .reset_index()
+    )
+    if daily.empty:
+        return daily.assign(**{"线性拟合偏差(秒)": []}), np.nan
+
+    # 以日为单位线性拟合（按有效窗口数加权），斜率即漂移
+    day_number = (daily["日期"] - daily["日期"].iloc[0]) / pd.Timedelta("1D")
+    if len(daily) > 1:
+        drift, intercept = np.polyfit(
+            day_number, daily["偏差(秒)"], 1, w=np.sqrt(daily["有效窗口数"])
+        )
+    else:
+        drift, intercept = 0.0, daily["偏差(秒)"].iloc[0]
+    daily.insert(2, "线性拟合偏差(秒)", intercept + drift * day_number)
+    daily["日期"] = daily["日期"].dt.date
+    return daily, drift
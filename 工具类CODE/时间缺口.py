@@ -0,0 +1,146 @@
+import os
+import numpy as np
+import pandas as pd
+from 表格缓存 import save_columnar, read_columnar
+
+# 时间缺口检测引擎
+# 不生成完整时间网格，直接由排序后时间戳的相邻差值求出缺失区间，
+# 以 (起始序号, 缺失点数) 的游程对表示，内存与数据量成正比、与时间跨度无关。
+
+
+def freq_step(freq):
+    """将固定频率字符串（如 "min"、"10s"、"D"）转换为 Timedelta"""
+    return pd.Timedelta(pd.tseries.frequencies.to_offset(freq).nanos)
+
+
+def time_ticks(times, freq="min"):
+    """将时间截断到 freq 并转换为排序去重后的整数刻度，返回 (刻度数组, 起点时间)"""
+    times = pd.DatetimeIndex(pd.to_datetime(times)).dropna().as_unit("ns")
+    if len(times) == 0:
+        return np.array([], dtype=np.int64), None
+    step = freq_step(freq).value
+    values = times.floor(freq).asi8
+    origin = values.min()
+    ticks = np.unique((values - origin) // step)
+    return ticks, pd.Timestamp(origin)
+
+
+def find_gaps(times, freq="min"):
+    """检测缺失区间，返回 DataFrame：起始序号、缺失点数、开始时间、结束时间"""
+    ticks, origin = time_ticks(times, freq)
+    diffs = np.diff(ticks)
+    idx = np.flatnonzero(diffs > 1)
+
+    starts = ticks[idx] + 1
+    lengths = diffs[idx] - 1
+    step = freq_step(freq)
+    gaps = pd.DataFrame({"起始序号": starts, "缺失点数": lengths})
+    if origin is not None:
+        gaps["开始时间"] = origin + starts * step
+        gaps["结束时间"] = origin + (starts + lengths - 1) * step
+    else:
+        gaps["开始时间"] = pd.Series(dtype="datetime64[ns]")
+        gaps["结束时间"] = pd.Series(dtype="datetime64[ns]")
+    return gaps
+
+
+def channel_gaps(df, time_col="时间", freq="min"):
+    """按通道检测缺口（时间点缺失或数值为空均视为缺失），返回 (缺口表, 覆盖范围表)"""
+    times = pd.to_datetime(df[time_col])
+    gap_tables = []
+    coverage = []
+    for col in df.columns.drop(time_col):
+        valid = times[df[col].notna()]
+        if valid.empty:
+            continue
+        gaps = find_gaps(valid, freq)
+        gaps.insert(0, "通道", col)
+        gap_tables.append(gaps)
+        valid = valid.dt.floor(freq)
+        coverage.append({"通道": col, "数据开始": valid.min(), "数据结束": valid.max()})
+
+    if gap_tables:
+        gaps = pd.concat(gap_tables, ignore_index=True)
+    else:
+        gaps = find_gaps([], freq)
+        gaps.insert(0, "通道", pd.Series(dtype=object))
+    return gaps, pd.DataFrame(coverage, columns=["通道", "数据开始", "数据结束"])
+
+
+class GapIndex:
+    """按 (平台, 通道) 组织的缺口区间索引
+
+    每个通道的缺口按开始时间排序且互不重叠，结束时间同样单调，
+    因此任意时间窗的完整性查询只需一次二分查找（对数时间）。
+    """
+
+    def __init__(self, gaps, coverage):
+        self.gaps = gaps.reset_index(drop=True)
+        self.coverage = coverage.reset_index(drop=True)
+        self._spans = {}
+        self._intervals = {}
+        self._groups = {}
+
+        for row in self.coverage.itertuples(index=False):
+            self._spans[(row.平台, row.通道)] = (
+                pd.Timestamp(row.数据开始).value,
+                pd.Timestamp(row.数据结束).value,
+            )
+        for key, group in self.gaps.groupby(["平台", "通道"], sort=False):
+            group = group.sort_values("开始时间")
+            self._groups[key] = group
+            self._intervals[key] = (
+                pd.DatetimeIndex(group["开始时间"]).as_unit("ns").asi8,
+                pd.DatetimeIndex(group["结束时间"]).as_unit("ns").asi8,
+            )
+
+    @property
+    def channels(self):
+        """索引中的全部 (平台, 通道)"""
+        return list(self._spans)
+
+    def is_complete(self, station, channel, t1, t2):
+        """判断通道在 [t1, t2] 内是否每个时间点都有数据"""
+        span = self._spans.get((station, channel))
+        if span is None:
+            return False
+        t1, t2 = pd.Timestamp(t1).value, pd.Timestamp(t2).value
+        if t1 < span[0] or t2 > span[1]:
+            return False
+        starts, ends = self._intervals.get((station, channel), ((), ()))
+        i = np.searchsorted(starts, t2, side="right") - 1
+        return i < 0 or ends[i] < t1
+
+    def complete_channels(self, t1, t2, station=None):
+        """返回在 [t1, t2] 内数据完整的 (平台, 通道) 列表"""
+        return [
+            key
+            for key in self._spans
+            if (station is None or key[0] == station) and self.is_complete(*key, t1, t2)
+        ]
+
+    def gaps_between(self, station, channel, t1, t2):
+        """返回与 [t1, t2] 相交的缺口，用于标记坏窗口"""
+        starts, ends = self._intervals.get((station, channel), ((), ()))
+        t1, t2 = pd.Timestamp(t1).value, pd.Timestamp(t2).value
+        lo = np.searchsorted(ends, t1, side="left")
+        hi = np.searchsorted(starts, t2, side="right")
+        group = self._groups.get((station, channel), self.gaps.iloc[:0])
+        return group.iloc[lo:hi]
+
+    def save(self, output_dir):
+        """保存索引（缺口表和覆盖范围表）"""
+        save_columnar(self.gaps, os.path.join(output_dir, "缺口索引_缺口.parquet"))
+        save_columnar(self.coverage, os.path.join(output_dir, "缺口索引_覆盖.parquet"))
+
+    @classmethod
+    def load(cls, output_dir):
+        """读取 save() 保存的索引"""
+        tables = []
+        for name in ("缺口索引_缺口", "缺口索引_覆盖"):
+            table = read_columnar(os.path.join(output_dir, name + ".parquet"))
+            for col in ("开始时间", "结束时间", "数据开始", "数据结束"):
+                if col in table.columns:
+                    table[col] = pd.to_datetime(table[col])
+            tables.append(table)
+        return cls(*tables)
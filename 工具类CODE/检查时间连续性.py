@@ -1,15 +1,27 @@
+import os
 import pandas as pd
-from datetime import timedelta
+from 表格缓存 import read_excel_cached, save_columnar
+from 时间缺口 import find_gaps, channel_gaps, GapIndex
+from 批量执行 import run_batch
 
+# 多平台审查配置：平台名 -> 每分钟数据所在目录
+AUDIT_SOURCES = {
+    "CR1000X": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据",
+    "锦州阳光": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据",
+}
+AUDIT_OUTPUT_DIR = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\缺口索引"
 
-def check_time_continuity():
+
+def check_time_continuity(write_text=True, max_report_gaps=20):
+    """检查时间连续性，返回缺失时间段表；write_text=False 时只输出表格"""
     # 文件路径配置
     file_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据\锦州阳光_温度1-9_全30日数据(每分钟).xlsx"
     output_file_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据\缺失时间段统计.txt"
+    gap_table_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据\缺失时间段表.parquet"
 
     try:
         # 读取Excel文件的第一列（时间列）
-        df = pd.read_excel(
+        df = read_excel_cached(
             file_path,
             usecols=[0],  # 读取第一列
             header=0,  # 无表头
@@ -47,99 +59,140 @@ def check_time_continuity():
     # 按时间排序并去重
     df = df.sort_values("时间").drop_duplicates()
 
-    # 生成完整时间序列（分钟级别）
+    # 由相邻时间差直接求缺失区间（不生成完整时间序列）
+    gaps = find_gaps(df["时间"], freq="min")
     start_time = df["时间"].iloc[0]
     end_time = df["时间"].iloc[-1]
-    full_range = pd.date_range(start=start_time, end=end_time, freq="T")
-
-    # 找出缺失时间点
-    missing = full_range[~full_range.isin(df["时间"])]
+    expected = int((end_time - start_time) / pd.Timedelta(minutes=1)) + 1
+    missing_total = int(gaps["缺失点数"].sum())
 
     # 结果输出
-    if len(missing) == 0:
+    if len(gaps) == 0:
         print("\n✅ 时间序列完整，无缺失数据")
         print(f"时间范围：{start_time} 至 {end_time}")
         print(f"总数据量：{len(df)}条")
-        return
+        return gaps
+
+    # 缺失时间段表（Parquet/CSV）
+    saved_path = save_columnar(gaps, gap_table_path)
+
+    print(f"\n⚠️ 发现{missing_total}个缺失时间点，共{len(gaps)}个缺失时间段")
+    print(f"最长缺失时间段：{gaps['缺失点数'].max()}分钟")
+    print(f"缺失时间段表已保存到：{saved_path}")
 
-    # 分组显示连续缺失时间段
-    print(f"\n⚠️ 发现{len(missing)}个缺失时间点")
-    print("----------------------------------------")
+    if not write_text:
+        return gaps
 
-    missing_series = pd.Series(missing, name="缺失时间")
-    gaps = missing_series.groupby(
-        (missing_series.diff() != timedelta(minutes=1)).cumsum()
+    # 文本报告只列出最长的若干个缺失时间段
+    shown = gaps.nlargest(max_report_gaps, "缺失点数", keep="first").sort_values(
+        "起始序号"
     )
 
-    # 统计缺失时间段的信息
-    gap_info = []
-    for gap_id, (_, gap) in enumerate(gaps, 1):
-        if len(gap) == 1:
-            gap_info.append(
-                {
-                    "类型": "单点缺失",
-                    "开始时间": gap.iloc[0],
-                    "结束时间": gap.iloc[0],
-                    "持续时长": 1,
-                }
-            )
-            print(f"缺失时间点 #{gap_id}: {gap.iloc[0].strftime('%Y-%m-%d %H:%M')}")
-        else:
-            duration = (gap.iloc[-1] - gap.iloc[0]).total_seconds() / 60 + 1
-            gap_info.append(
-                {
-                    "类型": "连续缺失",
-                    "开始时间": gap.iloc[0],
-                    "结束时间": gap.iloc[-1],
-                    "持续时长": int(duration),
-                }
-            )
-            print(f"连续缺失时间段 #{gap_id}:")
-            print(f"▸ 开始时间：{gap.iloc[0].strftime('%Y-%m-%d %H:%M')}")
-            print(f"▸ 结束时间：{gap.iloc[-1].strftime('%Y-%m-%d %H:%M')}")
-            print(f"▸ 持续时长：{int(duration)}分钟")
-            print(
-                f"▸ 缺失时间点示例：{gap.iloc[0].strftime('%H:%M')} ~ {gap.iloc[-1].strftime('%H:%M')}"
-            )
-        print("----------------------------------------")
+    def fmt(t):
+        return t.strftime("%Y-%m-%d %H:%M")
 
     # 将统计信息写入TXT文件
     with open(output_file_path, "w", encoding="utf-8") as f:
         f.write("====== 缺失时间段统计 ======\n")
         f.write(f"时间范围：{start_time} 至 {end_time}\n")
-        f.write(f"应存在数据：{len(full_range)}条\n")
+        f.write(f"应存在数据：{expected}条\n")
         f.write(f"实际存在数据：{len(df)}条\n")
-        f.write(f"完整度：{len(df)/len(full_range):.2%}\n\n")
+        f.write(f"完整度：{len(df)/expected:.2%}\n\n")
 
-        f.write("====== 缺失时间段详情 ======\n")
-        for info in gap_info:
-            if info["类型"] == "单点缺失":
-                f.write(f"单点缺失：{info['开始时间'].strftime('%Y-%m-%d %H:%M')}\n")
+        f.write(f"====== 缺失时间段详情（最长的{len(shown)}个） ======\n")
+        for row in shown.itertuples(index=False):
+            if row.缺失点数 == 1:
+                f.write(f"单点缺失：{fmt(row.开始时间)}\n")
             else:
                 f.write(
-                    f"连续缺失：{info['开始时间'].strftime('%Y-%m-%d %H:%M')} ~ "
-                    f"{info['结束时间'].strftime('%Y-%m-%d %H:%M')}, "
-                    f"持续时长：{info['持续时长']}分钟\n"
+                    f"连续缺失：{fmt(row.开始时间)} ~ {fmt(row.结束时间)}, "
+                    f"持续时长：{row.缺失点数}分钟\n"
                 )
+        if len(shown) < len(gaps):
+            f.write(f"……其余{len(gaps) - len(shown)}个时间段见缺失时间段表\n")
 
         # 统计缺失时间段的汇总信息
+        max_gap = gaps.loc[gaps["缺失点数"].idxmax()]
+        min_gap = gaps.loc[gaps["缺失点数"].idxmin()]
         f.write("\n====== 缺失时间段汇总 ======\n")
-        f.write(f"总缺失时间点数量：{len(missing)}\n")
-        f.write(f"总缺失时间段数量：{len(gap_info)}\n")
-        if len(gap_info) > 0:
-            max_gap = max(gap_info, key=lambda x: x["持续时长"])
-            min_gap = min(gap_info, key=lambda x: x["持续时长"])
-            f.write(
-                f"最长缺失时间段：{max_gap['持续时长']}分钟（{max_gap['开始时间'].strftime('%Y-%m-%d %H:%M')} ~ {max_gap['结束时间'].strftime('%Y-%m-%d %H:%M')})\n"
-            )
-            f.write(
-                f"最短缺失时间段：{min_gap['持续时长']}分钟（{min_gap['开始时间'].strftime('%Y-%m-%d %H:%M')} ~ {min_gap['结束时间'].strftime('%Y-%m-%d %H:%M')})\n"
-            )
+        f.write(f"总缺失时间点数量：{missing_total}\n")
+        f.write(f"总缺失时间段数量：{len(gaps)}\n")
+        f.write(f"单点缺失数量：{int((gaps['缺失点数'] == 1).sum())}\n")
+        f.write(
+            f"最长缺失时间段：{max_gap['缺失点数']}分钟（{fmt(max_gap['开始时间'])} ~ {fmt(max_gap['结束时间'])})\n"
+        )
+        f.write(
+            f"最短缺失时间段：{min_gap['缺失点数']}分钟（{fmt(min_gap['开始时间'])} ~ {fmt(min_gap['结束时间'])})\n"
+        )
 
     print(f"\n📊 统计信息和缺失时间段已保存到：{output_file_path}")
+    return gaps
+
+
+def audit_file(task):
+    """审查单个每分钟数据文件（在子进程中执行），返回 (缺口表, 覆盖范围表)"""
+    file_path, station = task
+    df = read_excel_cached(file_path)
+    df = df.rename(columns={df.columns[0]: "时间"}).dropna(subset=["时间"])
+    df["时间"] = pd.to_datetime(df["时间"])
+
+    gaps, coverage = channel_gaps(df, time_col="时间", freq="min")
+    for table in (gaps, coverage):
+        table.insert(0, "平台", station)
+        table.insert(1, "文件", os.path.basename(file_path))
+    return gaps, coverage
+
+
+def audit_all_files(max_workers=None):
+    """并行审查两个平台的全部每分钟数据，建立 (平台, 通道) 缺口索引"""
+    tasks = [
+        (os.path.join(folder, f), station)
+        for station, folder in AUDIT_SOURCES.items()
+        for f in sorted(os.listdir(folder))
+        if f.endswith(".xlsx") and "(每分钟)" in f and not f.startswith("~$")
+    ]
+    print(f"共发现{len(tasks)}个每分钟数据文件")
+
+    gap_tables, coverage_tables = [], []
+    for (file_path, station), result, error in run_batch(
+        audit_file, tasks, max_workers=max_workers
+    ):
+        name = os.path.basename(file_path)
+        if error is not None:
+            print(f"❌ {station} {name} 审查失败：{error}")
+            continue
+        gaps, coverage = result
+        gap_tables.append(gaps)
+        coverage_tables.append(coverage)
+        print(f"✅ {station} {name}：{len(coverage)}个通道，{len(gaps)}个缺失时间段")
+
+    if not coverage_tables:
+        print("未生成缺口索引")
+        return None
+
+    # 同一平台的同名通道只保留首次出现的文件
+    coverage = pd.concat(coverage_tables, ignore_index=True)
+    duplicated = coverage.duplicated(subset=["平台", "通道"], keep="first")
+    for row in coverage[duplicated].itertuples(index=False):
+        print(f"⚠️ {row.平台} 通道 {row.通道} 在 {row.文件} 中重复出现，已忽略")
+    coverage = coverage[~duplicated]
+    gaps = pd.concat(gap_tables, ignore_index=True).merge(
+        coverage[["平台", "通道", "文件"]], on=["平台", "通道", "文件"]
+    )
+
+    index = GapIndex(gaps, coverage)
+    os.makedirs(AUDIT_OUTPUT_DIR, exist_ok=True)
+    index.save(AUDIT_OUTPUT_DIR)
+    print(f"\n📊 缺口索引已保存到：{AUDIT_OUTPUT_DIR}")
+    return index
 
 
 if __name__ == "__main__":
+    audit_mode = False  # True：审查两个平台的全部每分钟数据并建立缺口索引
+
     print("====== 时间序列完整性检查程序 ======")
-    check_time_continuity()
+    if audit_mode:
+        audit_all_files()
+    else:
+        check_time_continuity()
     print("\n检测完成，请关闭窗口")
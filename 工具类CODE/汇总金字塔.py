@@ -0,0 +1,167 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from 表格缓存 import read_excel_cached, save_columnar, read_columnar
+from 时间缺口 import freq_step
+
+# 多级汇总（rollup）存储
+# 对分钟网格只遍历一次，得到 10 分钟级的部分统计量（计数、和、最小、最大），
+# 更粗的小时、日、周级别由上一级的统计量逐级合并，不再回到分钟数据。
+# 查询时返回满足所需时间分辨率的最粗级别，绘图和报表只需读取几百行。
+
+# 级别名称 → 时间步长（由细到粗）
+LEVELS = {
+    "10分钟": pd.Timedelta("10min"),
+    "小时": pd.Timedelta("1h"),
+    "日": pd.Timedelta("1D"),
+    "周": pd.Timedelta("7D"),
+}
+STATS = ("mean", "min", "max", "count")
+
+
+def level_labels(times, level):
+    """各时间点所属区间的起点；周以周一 0 点为起点"""
+    times = pd.DatetimeIndex(times)
+    if level == "周":
+        days = times.normalize()
+        return days - pd.to_timedelta(days.dayofweek, unit="D")
+    return times.floor(LEVELS[level])
+
+
+def _merge_groups(labels, parts):
+    """按有序的区间标签合并部分统计量，返回 (区间标签, 合并后的统计量)"""
+    labels = pd.DatetimeIndex(labels)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    merged = {
+        "count": np.add.reduceat(parts["count"], starts, axis=0),
+        "sum": np.add.reduceat(parts["sum"], starts, axis=0),
+        "min": np.fmin.reduceat(parts["min"], starts, axis=0),
+        "max": np.fmax.reduceat(parts["max"], starts, axis=0),
+    }
+    return labels[starts], merged
+
+
+def _to_frame(labels, parts, columns, time_col):
+    """统计量 → 首列为时间、其余列为 “通道_统计量” 的表"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        results = {
+            "mean": parts["sum"] / parts["count"],
+            "min": parts["min"],
+            "max": parts["max"],
+            "count": parts["count"],
+        }
+    data = {time_col: labels}
+    for i, col in enumerate(columns):
+        for stat in STATS:
+            data[f"{col}_{stat}"] = results[stat][:, i]
+    return pd.DataFrame(data)
+
+
+class RollupStore:
+    """10 分钟 / 小时 / 日 / 周 四级汇总表
+
+    各级表首列为区间起点，其余列为 “通道_mean / _min / _max / _count”。
+    """
+
+    def __init__(self, levels, time_col="时间"):
+        self.levels = levels
+        self.time_col = time_col
+
+    @classmethod
+    def build(cls, df, time_col="时间"):
+        """由分钟网格（时间列 + 数值通道）构建全部级别"""
+        df = df.sort_values(time_col)
+        columns = list(df.columns.drop(time_col))
+        values = df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(float)
+        valid = ~np.isnan(values)
+        parts = {
+            "count": valid.astype(float),
+            "sum": np.where(valid, values, 0.0),
+            "min": values,
+            "max": values,
+        }
+
+        labels = pd.DatetimeIndex(pd.to_datetime(df[time_col]))
+        levels = {}
+        for level in LEVELS:
+            labels, parts = _merge_groups(level_labels(labels, level), parts)
+            levels[level] = _to_frame(labels, parts, columns, time_col)
+        return cls(levels, time_col)
+
+    @property
+    def channels(self):
+        """存储中的全部通道"""
+        first = next(iter(self.levels.values()))
+        return [c[: -len("_count")] for c in first.columns if c.endswith("_count")]
+
+    def level_for(self, resolution):
+        """满足时间分辨率 resolution（如 "1h"、"6h"、"D"、"W"）的最粗级别
+
+        除固定频率外，周频率（"W"、"W-MON" 等）按 7 天处理；月、年等不固定频率不支持。
+        """
+        offset = to_offset(resolution)
+        if isinstance(offset, pd.offsets.Week):
+            resolution = LEVELS["周"] * offset.n
+        else:
+            resolution = freq_step(resolution)
+        usable = [level for level, step in LEVELS.items() if step <= resolution]
+        if not usable:
+            raise ValueError(
+                f"所需分辨率 {resolution} 小于最细级别 10 分钟，请直接读取分钟数据"
+            )
+        return usable[-1]
+
+    def query(self, resolution, start=None, end=None, channels=None, stats=("mean",)):
+        """按所需分辨率读取汇总数据，返回以时间为索引的表
+
+        只有一种统计量时列名为通道名，否则为 “通道_统计量”。
+        """
+        table = self.levels[self.level_for(resolution)]
+        times = table[self.time_col]
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            mask &= (times >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (times <= pd.Timestamp(end)).to_numpy()
+
+        channels = self.channels if channels is None else list(channels)
+        cols = [f"{ch}_{stat}" for ch in channels for stat in stats]
+        result = table.loc[mask, [self.time_col, *cols]].set_index(self.time_col)
+        if len(stats) == 1:
+            result.columns = channels
+        return result
+
+    def save(self, output_dir):
+        """每个级别保存为一个列式文件"""
+        os.makedirs(output_dir, exist_ok=True)
+        for level, table in self.levels.items():
+            save_columnar(table, os.path.join(output_dir, f"汇总_{level}.parquet"))
+
+    @classmethod
+    def load(cls, output_dir, time_col="时间"):
+        """读取 save() 保存的汇总表"""
+        levels = {}
+        for level in LEVELS:
+            table = read_columnar(os.path.join(output_dir, f"汇总_{level}.parquet"))
+            table[time_col] = pd.to_datetime(table[time_col])
+            levels[level] = table
+        return cls(levels, time_col)
+
+
+if __name__ == "__main__":
+    # 为分钟数据文件生成汇总存储，保存在同目录的 “汇总金字塔/文件名” 下
+    minute_files = [
+        r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\CR1000X平均数据(每分钟).xlsx",
+    ]
+    for file_path in minute_files:
+        df = read_excel_cached(file_path)
+        df["时间"] = pd.to_datetime(df["时间"])
+        numeric = ["时间", *df.select_dtypes("number").columns]
+        store = RollupStore.build(df[numeric])
+        output_dir = Path(file_path).parent / "汇总金字塔" / Path(file_path).stem
+        store.save(output_dir)
+        sizes = "，".join(f"{k} {len(v)} 行" for k, v in store.levels.items())
+        print(f"{Path(file_path).name}：{sizes}，已保存至 {output_dir}")
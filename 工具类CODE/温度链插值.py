@@ -0,0 +1,141 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from scipy import interpolate
+
+# 温度链深度插值引擎
+# 传感器深度固定不变，样条/线性插值结果对各深度的观测值是线性的，
+# 因此插值权重只与深度有关，可预先计算成一个算子矩阵，
+# 再用一次矩阵乘法完成所有时间点的插值（代替逐时间点构造 interp1d）。
+
+INTERP_KINDS = ("linear", "quadratic", "cubic")
+
+
+def build_interp_operator(depths, new_depths, kind="quadratic"):
+    """预计算插值算子：返回权重矩阵和依赖掩码，形状均为 (len(new_depths), len(depths))"""
+    if kind not in INTERP_KINDS:
+        raise ValueError(f"不支持的插值方式：{kind}，可选 {INTERP_KINDS}")
+
+    depths = np.asarray(depths, dtype=float)
+    order = np.argsort(depths)
+
+    # 对单位矩阵插值，得到每个传感器对各插值深度的贡献权重
+    f = interpolate.interp1d(
+        depths[order],
+        np.eye(len(depths)),
+        kind=kind,
+        axis=0,
+        fill_value="extrapolate",
+    )
+    new_depths = np.asarray(new_depths, dtype=float)
+    weights = np.empty((len(new_depths), len(depths)))
+    weights[:, order] = f(new_depths)
+
+    # 依赖掩码：某传感器缺测时，哪些插值深度会变为 NaN
+    if kind == "linear":
+        # 线性插值只用到所在区间两端的传感器（外推时为最外侧区间）
+        hi = np.clip(np.searchsorted(depths[order], new_depths), 1, len(depths) - 1)
+        support = np.zeros_like(weights, dtype=bool)
+        rows = np.arange(len(new_depths))
+        support[rows, order[hi - 1]] = True
+        support[rows, order[hi]] = True
+    else:
+        # 样条系数由全部节点联立求解，任一缺测都会影响整条廓线
+        support = np.ones_like(weights, dtype=bool)
+    return weights, support
+
+
+def apply_interp_operator(values, weights, support):
+    """将插值算子作用于 (时间, 传感器) 矩阵，返回 (时间, 插值深度) 矩阵"""
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values @ weights.T
+
+    # 缺测值按依赖掩码传播，与逐点 interp1d 的结果保持一致
+    result = np.where(missing, 0.0, values) @ weights.T
+    result[(missing.astype(float) @ support.T) > 0] = np.nan
+    return result
+
+
+def interpolate_profiles(values, depths, new_depths, kind="quadratic"):
+    """一次性对所有时间点的温度廓线进行深度插值"""
+    weights, support = build_interp_operator(depths, new_depths, kind)
+    return apply_interp_operator(values, weights, support)
+
+
+def chunk_rows(n_new_depths, max_memory_mb):
+    """每块处理的时间点数：float64 中间结果与缺测掩码的内存不超过 max_memory_mb"""
+    bytes_per_row = n_new_depths * (8 + 8)
+    return max(1, int(max_memory_mb * 2**20 // bytes_per_row))
+
+
+def interpolate_profiles_into(
+    values, depths, new_depths, out, kind="quadratic", max_memory_mb=256
+):
+    """按时间分块插值并写入预分配的 out（可为 float32 内存映射数组），返回 out"""
+    weights, support = build_interp_operator(depths, new_depths, kind)
+    step = chunk_rows(len(new_depths), max_memory_mb)
+    for start in range(0, len(values), step):
+        chunk = values[start : start + step]
+        out[start : start + len(chunk)] = apply_interp_operator(chunk, weights, support)
+    return out
+
+
+def profile_cache_key(df_temp, depths, new_depths, kind):
+    """插值结果的缓存键：源数据（时间+数值）、传感器列、深度、插值深度序列和插值方式"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(df_temp.index.asi8).tobytes())
+    digest.update(np.ascontiguousarray(df_temp.to_numpy(dtype=float)).tobytes())
+    digest.update(repr(list(df_temp.columns)).encode("utf-8"))
+    digest.update(np.asarray(depths, dtype=float).tobytes())
+    digest.update(np.asarray(new_depths, dtype=float).tobytes())
+    digest.update(kind.encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def interpolate_profiles_cached(
+    df_temp, depths, new_depths, kind="quadratic", cache_dir=None, max_memory_mb=256
+):
+    """带磁盘缓存的分块深度插值，返回 (时间, 插值深度) 的 float32 矩阵
+
+    结果以 .npy 保存在 cache_dir，再次使用相同数据和配置时直接内存映射读取，
+    只修改配色、刻度等绘图参数时无需重新插值；配置相同的脚本共用同一份缓存。
+    插值按时间分块直接写入 float32 数组（有缓存目录时为内存映射文件），
+    峰值内存由 max_memory_mb 控制，与数据时长无关。
+    """
+    values = df_temp.to_numpy(dtype=float)
+    shape = (len(values), len(new_depths))
+    if cache_dir is None:
+        out = np.empty(shape, dtype=np.float32)
+        return interpolate_profiles_into(
+            values, depths, new_depths, out, kind, max_memory_mb
+        )
+
+    key = profile_cache_key(df_temp, depths, new_depths, kind)
+    cache_path = Path(cache_dir) / f"温度链插值_{key}.npy"
+    if not cache_path.exists():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # 每个写入者使用独立的临时文件，并行出图时多个进程可能同时生成同一缓存
+        fd, tmp_name = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f"{cache_path.stem}.", suffix=".tmp"
+        )
+        os.close(fd)
+        out = np.lib.format.open_memmap(
+            tmp_name, mode="w+", dtype=np.float32, shape=shape
+        )
+        interpolate_profiles_into(values, depths, new_depths, out, kind, max_memory_mb)
+        out.flush()
+        del out
+        try:
+            os.replace(tmp_name, cache_path)
+            print(f"插值结果已缓存：{cache_path}")
+        except PermissionError:
+            # Windows 下目标文件已被其他进程生成并打开：内容相同，视为命中
+            os.remove(tmp_name)
+            if not cache_path.exists():
+                raise
+    return np.load(cache_path, mmap_mode="r")
@@ -0,0 +1,85 @@
+import math
+import warnings
+
+import matplotlib as mpl
+import numpy as np
+
+# 分级细节（LOD）热力图渲染
+# 先按输出像素分辨率对时间轴和深度轴做块聚合（mean / min / max），再用 imshow 绘制一张图像，
+# 代替 sns.heatmap 为每个单元格生成网格多边形。
+# 坐标系与 sns.heatmap 一致：x 为列序号 [0, 列数]，y 为行序号 [0, 行数] 且向下递增，
+# 因此原有按序号设置的刻度位置无需修改。
+
+AGG_FUNCS = {"mean": np.nanmean, "min": np.nanmin, "max": np.nanmax}
+CHUNK_BLOCKS = 256  # 每次聚合的列块数，限制临时内存
+
+
+def _reduce_blocks(block, row_k, col_k, agg):
+    """对二维数组按 row_k × col_k 的块聚合（边缘不足一块的部分用 NaN 补齐）"""
+    rows = math.ceil(block.shape[0] / row_k)
+    cols = math.ceil(block.shape[1] / col_k)
+    padded = np.full((rows * row_k, cols * col_k), np.nan)
+    padded[: block.shape[0], : block.shape[1]] = block
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # 全空块
+        return AGG_FUNCS[agg](padded.reshape(rows, row_k, cols, col_k), axis=(1, 3))
+
+
+def downsample_grid(data, max_rows, max_cols, agg="mean"):
+    """将 (行, 列) 矩阵聚合到不超过 max_rows × max_cols"""
+    if agg not in AGG_FUNCS:
+        raise ValueError(f"不支持的聚合方式：{agg}，可选 {tuple(AGG_FUNCS)}")
+    n_rows, n_cols = data.shape
+    row_k = max(1, math.ceil(n_rows / max_rows))
+    col_k = max(1, math.ceil(n_cols / max_cols))
+    if row_k == 1 and col_k == 1:
+        return np.asarray(data, dtype=float)
+
+    # 按列分段聚合，临时内存只与一段的大小有关
+    step = col_k * CHUNK_BLOCKS
+    result = np.empty((math.ceil(n_rows / row_k), math.ceil(n_cols / col_k)))
+    for start in range(0, n_cols, step):
+        chunk = np.asarray(data[:, start : start + step], dtype=float)
+        reduced = _reduce_blocks(chunk, row_k, col_k, agg)
+        result[:, start // col_k : start // col_k + reduced.shape[1]] = reduced
+    return result
+
+
+def output_dpi(fig, dpi=None):
+    """保存图像时的分辨率：优先使用 dpi，其次 rcParams["savefig.dpi"]，否则为图形 dpi"""
+    if dpi is None:
+        dpi = mpl.rcParams["savefig.dpi"]
+    return fig.dpi if dpi == "figure" else float(dpi)
+
+
+def render_heatmap(ax, data, cmap, vmin, vmax, cbar_kws=None, agg="mean", dpi=None):
+    """按坐标轴的输出像素大小降采样后绘制热力图，返回 (图像, 颜色条)
+
+    dpi 为保存图像时的分辨率（默认见 output_dpi），屏幕上的 bbox 按其换算为输出像素。
+    """
+    data = data.to_numpy() if hasattr(data, "to_numpy") else np.asarray(data)
+    n_rows, n_cols = data.shape
+
+    # 输出像素分辨率
+    scale = output_dpi(ax.figure, dpi) / ax.figure.dpi
+    width_px = max(1, int(ax.bbox.width * scale))
+    height_px = max(1, int(ax.bbox.height * scale))
+    image_data = downsample_grid(data, height_px, width_px, agg)
+
+    image = ax.imshow(
+        image_data,
+        cmap=cmap,
+        vmin=vmin,
+        vmax=vmax,
+        aspect="auto",
+        interpolation="nearest",
+        extent=(0, n_cols, n_rows, 0),
+    )
+    ax.set_xlim(0, n_cols)
+    ax.set_ylim(n_rows, 0)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    cbar = ax.figure.colorbar(image, ax=ax, **(cbar_kws or {}))
+    cbar.outline.set_linewidth(0)
+    return image, cbar
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from 时间缺口 import freq_step
+
+# 分钟网格补全引擎
+# 直接按整数刻度把观测值写入预分配的网格数组（每个通道只分配一次），
+# 再按缺口长度分档选择 linear / nearest / none，并限制每个通道的最大补全长度。
+# 只补全两侧都有观测值的内部缺口，首尾缺测保持为空。
+
+FILL_METHODS = ("linear", "nearest", "none")
+
+# 默认分档：≤5 分钟线性插值，≤30 分钟取最近值，更长的缺口不补
+DEFAULT_FILL_RULES = [(5, "linear"), (30, "nearest")]
+
+
+def nan_runs(values):
+    """返回连续 NaN 段的 (起点, 长度) 数组"""
+    isnan = np.isnan(values)
+    edges = np.diff(np.concatenate(([False], isnan, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def run_methods(lengths, fill_rules, max_fill=None):
+    """按缺口长度为每个缺口选择补全方法"""
+    methods = np.full(len(lengths), "none", dtype=object)
+    remaining = np.ones(len(lengths), dtype=bool)
+    for limit, method in sorted(fill_rules, key=lambda r: r[0]):
+        if method not in FILL_METHODS:
+            raise ValueError(f"不支持的补全方式：{method}，可选 {FILL_METHODS}")
+        chosen = remaining & (lengths <= limit)
+        methods[chosen] = method
+        remaining &= ~chosen
+    if max_fill is not None:
+        methods[lengths > max_fill] = "none"
+    return methods
+
+
+def fill_channel(values, fill_rules=DEFAULT_FILL_RULES, max_fill=None):
+    """原地补全单个通道的网格数组，返回补全标记（True 表示该点为补全值）"""
+    filled = np.zeros(len(values), dtype=bool)
+    starts, lengths = nan_runs(values)
+
+    # 只处理内部缺口
+    interior = (starts > 0) & (starts + lengths < len(values))
+    starts, lengths = starts[interior], lengths[interior]
+    methods = run_methods(lengths, fill_rules, max_fill)
+
+    for method in ("linear", "nearest"):
+        selected = methods == method
+        if not selected.any():
+            continue
+        run_starts = np.repeat(starts[selected], lengths[selected])
+        run_lengths = np.repeat(lengths[selected], lengths[selected])
+        offsets = np.arange(len(run_starts)) - np.repeat(
+            np.cumsum(lengths[selected]) - lengths[selected], lengths[selected]
+        )
+        positions = run_starts + offsets
+
+        left = values[run_starts - 1]
+        right = values[run_starts + run_lengths]
+        if method == "linear":
+            weight = (offsets + 1) / (run_lengths + 1)
+            values[positions] = left + (right - left) * weight
+        else:
+            # 与两侧观测值距离相等时取左侧
+            values[positions] = np.where(
+                offsets + 1 <= run_lengths - offsets, left, right
+            )
+        filled[positions] = True
+    return filled
+
+
+def complete_minute_grid(
+    df, time_col, freq="min", fill_rules=DEFAULT_FILL_RULES, max_fill=None
+):
+    """将数据补全到完整时间网格，返回 (补全后数据, 补全标记)
+
+    时间列不能有空值；max_fill 可为统一的最大补全长度（网格点数），或 {列名: 最大补全长度} 字典。
+    """
+    step = freq_step(freq)
+    times = pd.DatetimeIndex(pd.to_datetime(df[time_col])).floor(freq).as_unit("ns")
+    origin = times.min()
+    rows = (times.asi8 - origin.value) // step.value
+
+    # 重复时间只保留首次出现
+    rows, first = np.unique(rows, return_index=True)
+    n_grid = int(rows[-1]) + 1
+
+    data = {time_col: origin + np.arange(n_grid) * step}
+    masks = {time_col: data[time_col]}
+    for col in df.columns.drop(time_col):
+        grid = np.full(n_grid, np.nan)
+        grid[rows] = pd.to_numeric(df[col], errors="coerce").to_numpy()[first]
+        limit = max_fill.get(col) if isinstance(max_fill, dict) else max_fill
+        masks[col] = fill_channel(grid, fill_rules, limit)
+        data[col] = grid
+
+    return pd.DataFrame(data, copy=False), pd.DataFrame(masks, copy=False)
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # 未安装pyarrow时退回直接读取Excel
+    pa = None
+
+# Excel 列式缓存
+# 首次读取时将工作簿转换为 Arrow IPC 文件（不压缩，可内存映射），
+# 之后按 路径 + 修改时间 + 文件大小 命中缓存，只加载需要的列；
+# 源文件变化后缓存自动失效并重新生成。
+
+CACHE_DIR_NAME = ".列式缓存"
+
+
+def _cache_paths(file_path, sheet_name, read_kwargs, cache_dir):
+    """返回 (缓存文件路径, 同一数据源旧缓存的匹配模式)"""
+    stat = os.stat(file_path)
+    source_key = repr((str(file_path), sheet_name, sorted(read_kwargs.items())))
+    version_key = f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    source_hash = hashlib.sha1(source_key.encode("utf-8")).hexdigest()[:16]
+    version_hash = hashlib.sha1(version_key.encode("utf-8")).hexdigest()[:8]
+    prefix = f"{file_path.stem}.{source_hash}"
+    return cache_dir / f"{prefix}.{version_hash}.arrow", f"{prefix}.*.arrow"
+
+
+def _write_cache(df, cache_path, stale_pattern):
+    """将DataFrame写为Arrow IPC文件，并清理同一数据源的旧缓存"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # 每个写入者使用独立的临时文件，多个进程同时生成同一缓存时互不干扰
+    fd, tmp_name = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=f"{cache_path.stem}.", suffix=".tmp"
+    )
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, cache_path)
+    except PermissionError:
+        # Windows 下目标文件正被其他进程写入或读取：已有完整缓存则视为命中
+        tmp_path.unlink(missing_ok=True)
+        if not cache_path.exists():
+            raise
+        return
+
+    for old in cache_path.parent.glob(stale_pattern):
+        if old != cache_path:
+            try:
+                old.unlink(missing_ok=True)
+            except PermissionError:  # 旧缓存仍被其他进程占用，下次再清理
+                pass
+
+
+def _select_columns(columns, usecols):
+    """将usecols（列名或列序号）转换为列名列表"""
+    if usecols is None:
+        return list(columns)
+    if isinstance(usecols, (str, int)):
+        usecols = [usecols]
+    return [columns[c] if isinstance(c, int) else c for c in usecols]
+
+
+def _apply_selection(df, usecols, names):
+    """对未经缓存读取的DataFrame应用列选择和重命名"""
+    df = df[_select_columns(df.columns, usecols)]
+    if names is not None:
+        df.columns = names
+    return df
+
+
+def read_excel_cached(
+    file_path, sheet_name=0, usecols=None, names=None, cache_dir=None, **kwargs
+):
+    """带列式缓存的 pd.read_excel，usecols 支持列名或列序号"""
+    file_path = Path(file_path).resolve()
+
+    # 多表读取或缺少pyarrow时直接读取Excel
+    if pa is None or sheet_name is None or isinstance(sheet_name, list):
+        return pd.read_excel(
+            file_path, sheet_name=sheet_name, usecols=usecols, names=names, **kwargs
+        )
+
+    cache_dir = Path(cache_dir) if cache_dir else file_path.parent / CACHE_DIR_NAME
+    cache_path, stale_pattern = _cache_paths(file_path, sheet_name, kwargs, cache_dir)
+
+    if not cache_path.exists():
+        # 转换时读取全部列，不同usecols的调用共用同一份缓存
+        df = pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            _write_cache(df, cache_path, stale_pattern)
+        except (pa.ArrowException, TypeError, ValueError, OSError) as e:
+            print(f"⚠️ 无法生成列式缓存，直接使用Excel数据：{e}")
+        return _apply_selection(df, usecols, names)
+
+    # 内存映射读取，只转换需要的列
+    with pa.memory_map(str(cache_path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        table = table.select(_select_columns(table.column_names, usecols))
+        df = table.to_pandas()
+    if names is not None:
+        df.columns = names
+    return df
+
+
+def save_columnar(df, output_path):
+    """保存列式结果：优先写 Parquet，未安装 pyarrow 时写 CSV，返回实际保存路径"""
+    if pa is not None:
+        df.to_parquet(output_path, index=False)
+        return str(output_path)
+    csv_path = os.path.splitext(output_path)[0] + ".csv"
+    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    return csv_path
+
+
+def read_columnar(output_path, columns=None):
+    """读取 save_columnar 保存的结果（Parquet 不存在时读取同名 CSV）"""
+    if os.path.exists(output_path):
+        return pd.read_parquet(output_path, columns=columns)
+    csv_path = os.path.splitext(output_path)[0] + ".csv"
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def read_table_cached(file_path, usecols=None, **kwargs):
+    """按扩展名读取数据表：.parquet/.csv 为列式结果，其余按 Excel 带缓存读取"""
+    if Path(file_path).suffix.lower() in (".parquet", ".csv"):
+        path = os.path.splitext(file_path)[0] + ".parquet"
+        return read_columnar(path, columns=usecols)
+    return read_excel_cached(file_path, usecols=usecols, **kwargs)
+
+
+def iter_table_chunks(file_path, usecols=None, chunk_rows=None):
+    """逐块读取数据表；Parquet 按行组流式读取，其余整表读取后分块（chunk_rows=None 为整表一块）"""
+    if Path(file_path).suffix.lower() == ".parquet" and pa is not None and chunk_rows:
+        parquet_file = pa.parquet.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=usecols):
+            yield batch.to_pandas()
+        return
+
+    df = read_table_cached(file_path, usecols=usecols)
+    step = chunk_rows or max(len(df), 1)
+    for start in range(0, len(df), step):
+        yield df.iloc[start : start + step]
@@ -0,0 +1,69 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 高度计降噪参数扫描
+# 滑动中位数只与降噪窗口有关，每个窗口只计算一次；
+# 阈值 × 平滑窗口 的组合在进程池中并行评估，输出紧凑的结果表。
+
+_shared = {}
+
+
+def denoise_with_median(series, rolling_median, threshold):
+    """按滑动中位数 ±threshold 的范围剔除异常值（超出范围置为 NaN）"""
+    lower = rolling_median * (1 - threshold)
+    upper = rolling_median * (1 + threshold)
+    return series.where(series.between(lower, upper))
+
+
+def smooth_daily(processed, window_size):
+    """线性插值 → 滑动平均 → 按天求均值，返回 (滑动平均序列, 日均值序列)"""
+    sma = processed.interpolate().rolling(window=window_size, min_periods=1).mean()
+    return sma, sma.resample("D").mean()
+
+
+def _init_worker(series, medians, start, end):
+    """子进程初始化：原始序列和各窗口的滑动中位数只传输一次"""
+    _shared.update(series=series, medians=medians, start=start, end=end)
+
+
+def evaluate(params):
+    """评估一组参数，返回保留比例、残差方差和每日冰厚"""
+    denoise_window, threshold, window_size = params
+    series = _shared["series"]
+    processed = denoise_with_median(
+        series, _shared["medians"][denoise_window], threshold
+    )
+    sma, sma_daily = smooth_daily(processed, window_size)
+    residual = (processed - sma).dropna()
+
+    row = {
+        "降噪窗口": denoise_window,
+        "阈值": threshold,
+        "滑动平均窗口": window_size,
+        "保留比例": processed.count() / max(series.count(), 1),
+        "残差方差": residual.var() if len(residual) > 1 else np.nan,
+    }
+    daily = sma_daily.loc[_shared["start"] : _shared["end"]]
+    row.update({f"日均_{day:%m-%d}": value for day, value in daily.items()})
+    return row
+
+
+def sweep(
+    series, thresholds, window_sizes, denoise_windows, start, end, max_workers=None
+):
+    """对所有参数组合并行评估，返回每个组合一行的结果表"""
+    medians = {
+        w: series.rolling(window=w, min_periods=1).median() for w in denoise_windows
+    }
+    combos = list(itertools.product(denoise_windows, thresholds, window_sizes))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(series, medians, start, end),
+    ) as executor:
+        rows = list(executor.map(evaluate, combos))
+    return pd.DataFrame(rows)
@@ -1,28 +1,71 @@
 import pandas as pd
+import sys
+from pathlib import Path
 
-# 读取 Excel 文件中的 Sheet1 和 Sheet2
-file_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x初始数据\cr1000x有用的原始数据.xls"
-sheet1 = pd.read_excel(file_path, sheet_name="Sheet1")
-sheet2 = pd.read_excel(file_path, sheet_name="Sheet2")
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from TOA5读取 import iter_toa5_files, read_toa5_header
+from 分块重采样 import resample_chunks
 
-# 合并两张表
-data = pd.concat([sheet1, sheet2], ignore_index=True)
+# ================== 用户可调参数 ==================
+# 直接读取数据采集器输出的 TOA5 文本文件（.dat），无需先复制到 Excel
+raw_dir = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x初始数据"
+raw_pattern = "*.dat"
 
-# 将时间列转为 datetime 类型并设置为索引
-data["时间"] = pd.to_datetime(data["时间"])
-data.set_index("时间", inplace=True)
+# TOA5 字段名 → 输出列名（未列出的字段保留原名；TIMESTAMP 自动命名为“时间”）
+# 需按采集器程序中的字段名填写，例如 {"T_Avg(1)": "CR温度1", "DT_Avg": "高度计（冰厚）"}
+COLUMN_MAP = {}
+USECOLS = None  # 需要的 TOA5 字段，None 表示 COLUMN_MAP 中的字段（为空时读取全部）
+# 下游脚本读取的列名，输出中缺少任何一列时在处理前报错
+REQUIRED_COLUMNS = [
+    "CR温度1",
+    "CR温度2",
+    "高度计（冰厚）",
+    "溶解氧1（计算值）",
+    "溶解氧2（计算值）",
+]
+CHUNK_ROWS = 200_000  # 每次读取的行数
+RESAMPLE_FREQ = "min"  # 重采样间隔
+# 统计量：mean / min / max / std / count / last，多个统计量时列名为“字段_统计量”
+AGGREGATIONS = ("mean",)
 
-# 计算平均值，使用 'min' 代替 'T'
-mean_data = data.resample("min").mean()  # 'min'表示按分钟重采样
+output_file_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x初始数据\CR1000X平均数据(每分钟).xlsx"
+# ================================================
+
+raw_files = sorted(Path(raw_dir).glob(raw_pattern))
+if not raw_files:
+    raise FileNotFoundError(f"未找到原始数据文件：{Path(raw_dir) / raw_pattern}")
+if USECOLS is None and COLUMN_MAP:
+    USECOLS = list(COLUMN_MAP)
 
-# 重置索引以保留时间列
-mean_data.reset_index(inplace=True)
+# 先检查各文件重命名后的列是否覆盖下游需要的列名，避免处理完才在下游报 KeyError
+for raw_file in raw_files:
+    _, fields = read_toa5_header(raw_file)
+    available = [name for name, _, _ in fields]
+    selected = available if USECOLS is None else [n for n in available if n in USECOLS]
+    output_names = {COLUMN_MAP.get(name, name) for name in selected}
+    missing = [col for col in REQUIRED_COLUMNS if col not in output_names]
+    if missing:
+        raise KeyError(
+            f"{raw_file.name} 转换后缺少下游需要的列 {missing}，"
+            f"请在 COLUMN_MAP 中填写对应的 TOA5 字段。文件中的字段：{available}"
+        )
+
+# 分块读取并流式重采样，记录号不参与统计
+chunks = (
+    chunk.drop(columns="RECORD", errors="ignore")
+    for chunk in iter_toa5_files(
+        raw_files, usecols=USECOLS, rename=COLUMN_MAP, chunksize=CHUNK_ROWS
+    )
+)
+mean_data = pd.concat(
+    resample_chunks(chunks, freq=RESAMPLE_FREQ, aggs=AGGREGATIONS), ignore_index=True
+)
 
 # 格式化时间
 mean_data["时间"] = mean_data["时间"].dt.strftime("%Y/%m/%d %H:%M:%S")
 
 # 保存到新的 Excel 文件
-output_file_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x初始数据\CR1000X平均数据(每分钟).xlsx"
 mean_data.to_excel(output_file_path, index=False)
 
+print(f"已读取 {len(raw_files)} 个原始数据文件")
 print(f"数据平均值已保存至：{output_file_path}")
@@ -2,6 +2,11 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached, save_columnar
 
 # ================== 用户可调参数 ==================
 input_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\CR1000X平均数据(每分钟).xlsx"  # 输入文件路径
@@ -16,11 +21,50 @@ smooth_window = 5  # 滑动平均窗口
 os.makedirs(output_dir, exist_ok=True)
 
 
+def daily_rolling_filter(series):
+    """全序列一次完成 全局中值 → 局部中值 → 滑动平均，滑动窗口不跨越日界
+
+    各天数据之间插入不少于窗口长度的 NaN 间隔，使每个窗口只包含当天的点；
+    rolling().median() 使用跳表维护滑动中值，整个序列只需一次遍历。
+    返回 (滤波后的 DataFrame, 每个点所属日期的编号, 日期数组)。
+    """
+    series = series.dropna().sort_index()
+    day_codes, days = pd.factorize(series.index.floor("D"), sort=True)
+
+    # 每个数据点在带间隔数组中的位置
+    gap = max(median_window_global, median_window_local, smooth_window)
+    positions = np.arange(len(series)) + day_codes * gap
+    buffer = np.full(positions[-1] + 1 if len(positions) else 0, np.nan)
+
+    def rolling_stage(values, window, how):
+        buffer[:] = np.nan
+        buffer[positions] = values
+        rolling = pd.Series(buffer).rolling(window=window, min_periods=1, center=True)
+        return getattr(rolling, how)().to_numpy()[positions]
+
+    ice_global = rolling_stage(series.to_numpy(), median_window_global, "median")
+    ice_local = rolling_stage(ice_global, median_window_local, "median")
+    ice_smoothed = rolling_stage(ice_local, smooth_window, "mean")
+
+    filtered = pd.DataFrame(
+        {
+            "原始冰厚(m)": series.to_numpy(),
+            "全局中值(m)": ice_global,
+            "局部中值(m)": ice_local,
+            "平滑冰厚(m)": ice_smoothed,
+        },
+        index=series.index,
+    )
+    return filtered, day_codes, days
+
+
 def process_ice_thickness():
     """主处理函数：读取数据、滤波、计算日均冰厚"""
     # 读取原始数据
     try:
-        df = pd.read_excel(input_path, engine="openpyxl")  # 确保安装openpyxl
+        df = read_excel_cached(
+            input_path, usecols=["时间", "高度计（冰厚）"], engine="openpyxl"
+        )  # 确保安装openpyxl
         df["时间"] = pd.to_datetime(df["时间"])
         df.set_index("时间", inplace=True)
         print("数据读取成功，时间范围:", df.index.min(), "至", df.index.max())
@@ -28,50 +72,46 @@ def process_ice_thickness():
         print("文件读取失败，请检查路径和文件格式:", str(e))
         return
 
-    # 按天分组处理
-    daily_groups = df.groupby(pd.Grouper(freq="D"))
-    results = []
-
-    for day, day_data in daily_groups:
-        # 提取当天数据并去空
-        ice_series = day_data["高度计（冰厚）"].dropna()
-        if len(ice_series) < 10:  # 忽略数据量不足的天
-            print(f"跳过 {day.date()}（数据量不足）")
-            continue
-
-        # 分阶段滤波处理
-        try:
-            # 第一阶段：全局中值滤波（去除全天异常段）
-            ice_global = ice_series.rolling(
-                window=median_window_global, min_periods=1, center=True
-            ).median()
-
-            # 第二阶段：局部中值滤波（细化处理）
-            ice_local = ice_global.rolling(
-                window=median_window_local, min_periods=1, center=True
-            ).median()
-
-            # 滑动平均平滑
-            ice_smoothed = ice_local.rolling(
-                window=smooth_window, min_periods=1, center=True
-            ).mean()
-
-            # 计算当日均值
-            daily_mean = np.round(ice_smoothed.mean(), 3)
-            results.append(
-                {
-                    "日期": day.date(),
-                    "日均冰厚(m)": daily_mean,
-                    "数据点数": len(ice_series),
-                }
-            )
-            print(f"已处理 {day.date()}，冰厚: {daily_mean}m")
-        except Exception as e:
-            print(f"处理 {day.date()} 时出错:", str(e))
+    # 全序列一次滤波（窗口不跨越日界）
+    try:
+        filtered, day_codes, days = daily_rolling_filter(df["高度计（冰厚）"])
+    except Exception as e:
+        print("滤波处理出错:", str(e))
+        return
+
+    # 按日期编号一次性统计每日点数和均值
+    counts = np.bincount(day_codes, minlength=len(days))
+    sums = np.bincount(
+        day_codes, weights=filtered["平滑冰厚(m)"].to_numpy(), minlength=len(days)
+    )
+    daily = pd.DataFrame(
+        {
+            "日期": days.date,
+            "日均冰厚(m)": np.round(sums / np.maximum(counts, 1), 3),
+            "数据点数": counts,
+        }
+    )
+
+    # 忽略数据量不足的天（包括整天无数据的日期）
+    all_days = pd.date_range(df.index.min().floor("D"), df.index.max().floor("D"))
+    valid_days = set(days[counts >= 10].date)
+    for day in all_days.date:
+        if day not in valid_days:
+            print(f"跳过 {day}（数据量不足）")
+    result_df = daily[daily["数据点数"] >= 10].reset_index(drop=True)
+    for row in result_df.itertuples(index=False):
+        print(f"已处理 {row.日期}，冰厚: {row[1]}m")
+
+    # 保存滤波后的分钟序列（仅保留有效日期），供后续绘图直接读取
+    filtered = filtered[np.isin(day_codes, np.flatnonzero(counts >= 10))]
+    filtered_path = save_columnar(
+        filtered.reset_index(),
+        os.path.join(output_dir, "兴凯湖冰厚滤波序列_每分钟.parquet"),
+    )
+    print(f"滤波后的分钟序列已保存至: {filtered_path}")
 
     # 保存结果到Excel
-    if results:
-        result_df = pd.DataFrame(results)
+    if not result_df.empty:
         output_path = os.path.join(output_dir, "兴凯湖每日冰厚均值_处理结果.xlsx")
         result_df.to_excel(output_path, index=False)
         print(f"\n处理完成！结果已保存至: {output_path}")
@@ -0,0 +1,78 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import iter_table_chunks, save_columnar
+from 多源合并 import join_sources
+
+# ================== 用户可调参数 ==================
+# 各平台的分钟数据：时间列、需要的列 {原列名: 输出列名}、匹配容差、时钟偏差
+# 偏差为“校正后时间 - 记录时间”；也可填写 时钟偏差估计.py 输出的每日偏差文件路径
+SOURCES = [
+    {
+        "name": "CR1000X",
+        "path": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\CR1000X平均数据(每分钟).xlsx",
+        "time_col": "时间",
+        "columns": {"CR温度1": "CR温度1", "CR温度2": "CR温度2"},
+        "tolerance": "30s",
+        "offset": "0s",
+    },
+    {
+        "name": "锦州阳光",
+        "path": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据\锦州阳光_温度相关_全30日数据(每分钟).xlsx",
+        "time_col": "时间 ()",
+        "columns": {f"温度{i} (℃)": f"温度{i} (℃)" for i in range(9, 0, -1)},
+        "tolerance": "30s",
+        "offset": "0s",
+    },
+]
+# 每日偏差文件中使用的列：逐日实测 "偏差(秒)" 或线性拟合的 "线性拟合偏差(秒)"
+OFFSET_COLUMN = "偏差(秒)"
+CHUNK_ROWS = 50_000  # 每次读取的行数
+START_TIME = None  # 公共网格起止时间，None 表示取各平台数据范围
+END_TIME = None
+
+# 输出为列式文件，温度链脚本的 data_path 可直接指向该文件
+output_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\逐分钟温度链数据(合并).parquet"
+# ================================================
+
+
+def load_offset(offset):
+    """时钟偏差：固定值直接返回；文件路径则读取每日偏差表（日期, OFFSET_COLUMN）"""
+    if isinstance(offset, str) and Path(offset).suffix in (".parquet", ".csv"):
+        table = next(iter_table_chunks(offset))
+        return pd.Series(
+            pd.to_timedelta(table[OFFSET_COLUMN].to_numpy(), unit="s"),
+            index=pd.to_datetime(table["日期"]) + pd.Timedelta(hours=12),
+        )
+    return offset
+
+
+def build_sources():
+    """为每个平台创建流式读取的数据块迭代器"""
+    sources = []
+    for source in SOURCES:
+        usecols = [source["time_col"], *source["columns"]]
+        sources.append(
+            {
+                **source,
+                "chunks": iter_table_chunks(
+                    source["path"], usecols=usecols, chunk_rows=CHUNK_ROWS
+                ),
+                "offset": load_offset(source["offset"]),
+            }
+        )
+    return sources
+
+
+if __name__ == "__main__":
+    merged = join_sources(build_sources(), freq="min", start=START_TIME, end=END_TIME)
+    saved_path = save_columnar(merged, output_path)
+
+    print(
+        f"合并完成：{merged['时间'].min()} 至 {merged['时间'].max()}，共 {len(merged)} 行"
+    )
+    print("各列有效数据比例：")
+    print(merged.drop(columns="时间").notna().mean().round(3).to_string())
+    print(f"已保存至：{saved_path}")
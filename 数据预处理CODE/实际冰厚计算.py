@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 
 # 文件路径配置（注意：路径中的反斜杠需要转义或使用原始字符串）
@@ -7,6 +8,38 @@ output_dir = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR
 output_filename = "计算得出冰厚.csv"
 output_path = os.path.join(output_dir, output_filename)
 
+# 初始冰厚（单位：米）
+initial_thickness = 0.62  # 对应62厘米
+# 多站点/多样点同时计算：指定分组列（如 "样点"），并可为各组单独设置初始冰厚
+group_col = None
+initial_thickness_by_group = {}  # 例如 {"XKH01": 0.62, "XKH05": 0.60}
+
+
+def cumulative_thickness(df, value_col="高度计", group_col=None, initial=0.62):
+    """向量化计算冰厚：冰厚 = 初始冰厚 - (高度计读数 - 首个有效读数)
+
+    基准为首个非空读数（缺测的开头几行不影响其余行）；group_col 不为空时按组分别
+    以各组首个有效读数为基准。initial 可为数值或 {组名: 初始冰厚}。
+    返回 (冰厚(m), 冰厚(cm)) 两个数组。
+    """
+    values = df[value_col].to_numpy(dtype=float)
+    if group_col is None:
+        valid = values[~np.isnan(values)]
+        baseline = valid[0] if len(valid) else np.nan
+        start = initial
+    else:
+        groups = df[group_col]
+        baseline = df.groupby(group_col, sort=False)[value_col].transform("first")
+        baseline = baseline.to_numpy(dtype=float)
+        if isinstance(initial, dict):
+            start = groups.map(initial).to_numpy(dtype=float)
+        else:
+            start = initial
+
+    thickness_m = np.round(start - (values - baseline), 6)
+    thickness_cm = np.round(thickness_m * 100, 2)
+    return thickness_m, thickness_cm
+
 
 def calculate_ice_thickness():
     try:
@@ -24,19 +57,18 @@ def calculate_ice_thickness():
         if "高度计" not in df.columns:
             raise ValueError("CSV文件中缺少'高度计'列，请检查数据格式")
 
-        # 初始冰厚（单位：米）
-        initial_thickness = 0.62  # 对应62厘米
-        ice_thickness = [initial_thickness]
-
-        # 逐日计算冰厚
-        for i in range(1, len(df)):
-            delta = df["高度计"].iloc[i] - df["高度计"].iloc[i - 1]
-            new_thickness = ice_thickness[-1] - delta
-            ice_thickness.append(round(new_thickness, 6))  # 保留6位小数
-
-        # 添加结果列
-        df["冰厚(m)"] = ice_thickness
-        df["冰厚(cm)"] = [round(t * 100, 2) for t in ice_thickness]  # 增加厘米列
+        # 逐日冰厚（向量化计算，m 与 cm 两列一次写入）
+        initial = initial_thickness
+        if group_col and initial_thickness_by_group:
+            missing = set(df[group_col]) - set(initial_thickness_by_group)
+            if missing:
+                raise ValueError(f"以下分组缺少初始冰厚：{sorted(missing)}")
+            initial = initial_thickness_by_group
+        thickness_m, thickness_cm = cumulative_thickness(
+            df, "高度计", group_col=group_col, initial=initial
+        )
+        df["冰厚(m)"] = thickness_m
+        df["冰厚(cm)"] = thickness_cm  # 增加厘米列
 
         # 创建输出目录（如果不存在）
         os.makedirs(output_dir, exist_ok=True)
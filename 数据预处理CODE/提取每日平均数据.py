@@ -1,40 +1,135 @@
 import os
 import pandas as pd
 from pathlib import Path
+import sys
 
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import save_columnar, iter_table_chunks
+from 批量执行 import run_batch
+from 分块重采样 import resample_chunks
+from 太阳几何 import LONGITUDE, UTC_OFFSET
 
-def process_daily_average(input_folder, output_folder):
-    # 创建输出文件夹
-    output_path = Path(input_folder) / output_folder
-    output_path.mkdir(exist_ok=True)
+# ================== 用户可调参数 ==================
+# 日界：数据时间为北京时间，0 表示按北京时间 0 点分日；
+# "solar" 表示按观测站地方平太阳时 0 点分日；也可填写固定时差，如 "-1h"（北京时间 1 点分日）
+DAY_BOUNDARY = 0
+# 日统计量：默认只求均值，输出与原有 (每日) 文件相同（列名为原通道名）；
+# 需要时可加入 "min"、"max"、"std"、"count"，此时列名为 “通道_统计量”
+DAILY_STATS = ("mean",)
+CHUNK_ROWS = None  # 分块读取的行数，None 表示整表读取
+# ================================================
 
-    # 遍历输入文件夹中的所有xlsx文件
-    for file in Path(input_folder).glob("*.xlsx"):
-        if "(每分钟)" not in file.name:
-            continue
-        print(file.name)
 
-        # 读取Excel文件
-        df = pd.read_excel(file)
+def day_offset(boundary=DAY_BOUNDARY):
+    """日界对应的时间平移量：时间加上该平移量后按自然日分组"""
+    if boundary == "solar":
+        # 地方平太阳时与数据时区的差（东经 132.5° 约比北京时间早 50 分钟）
+        return pd.Timedelta(minutes=4 * LONGITUDE - 60 * UTC_OFFSET)
+    return pd.Timedelta(boundary)
+
+
+def daily_statistics(chunks, boundary=DAY_BOUNDARY, stats=DAILY_STATS):
+    """按整数日序号流式统计各数值通道的日统计量，返回首列为 “日期” 的表
+
+    与按日期 groupby 相同，只输出有数据行的日期；std 为样本标准差，count 为有效值个数。
+    数据块之间须按时间先后排列，否则报错。
+    """
+    offset = day_offset(boundary)
+    columns = None
+    row_col = "_行"  # 每行为 1 的辅助通道，用于统计各日的数据行数
+
+    def prepared():
+        nonlocal columns
+        last_time = None
+        for chunk in chunks:
+            times = pd.to_datetime(chunk["时间"])
+            if columns is None:
+                columns = list(
+                    chunk.drop(columns="时间").select_dtypes("number").columns
+                )
+            shifted = chunk[columns].copy()
+            shifted.insert(0, "时间", times + offset)
+            shifted[row_col] = 1.0
+            shifted = shifted.dropna(subset=["时间"]).sort_values("时间", kind="stable")
+            if shifted.empty:
+                continue
+            # 块内已排序；块与块之间若时间倒退，流式统计会把同一天拆成多段
+            if last_time is not None and shifted["时间"].iloc[0] < last_time:
+                raise ValueError(
+                    f"数据块时间未按先后排列：{shifted['时间'].iloc[0] - offset}"
+                    f" 早于上一块的 {last_time - offset}"
+                )
+            last_time = shifted["时间"].iloc[-1]
+            yield shifted
+
+    aggs = tuple(dict.fromkeys(("count", *stats)))
+
+    def name(col, agg):
+        return col if len(aggs) == 1 else f"{col}_{agg}"
+
+    parts = list(resample_chunks(prepared(), freq="D", aggs=aggs))
+    if not parts:
+        return pd.DataFrame(columns=["日期"])
+    daily = pd.concat(parts, ignore_index=True)
 
-        # 转换时间列为datetime类型
-        df["时间"] = pd.to_datetime(df["时间"])
+    # 删除没有数据行的日期（resample 补齐的空日期）
+    daily = daily[daily[name(row_col, "count")] > 0].reset_index(drop=True)
+    daily.insert(0, "日期", daily.pop("时间").dt.date)
+    keep = [name(col, stat) for col in columns for stat in stats]
+    daily = daily[["日期", *keep]]
+    if tuple(stats) == ("mean",):
+        daily.columns = ["日期", *columns]
+    return daily
 
-        # 提取日期列
-        df["日期"] = df["时间"].dt.date
-        print("计算中...")
-        # 按日期分组计算平均值
-        daily_avg = df.groupby("日期").mean(numeric_only=True).reset_index()
 
-        # 构建输出文件名
-        new_name = file.name.replace("(每分钟)", "(每日)")
-        output_file = output_path / new_name
+def average_file(file, output_path):
+    """计算单个文件的日统计量（在子进程中执行），返回该文件的日志行"""
+    log_content = [file.name]
 
-        # 保存结果
+    # 按整数日序号分块统计（日界见 DAY_BOUNDARY）
+    log_content.append("计算中...")
+    daily_avg = daily_statistics(iter_table_chunks(file, chunk_rows=CHUNK_ROWS))
+
+    # 构建输出文件名
+    new_name = file.name.replace("(每分钟)", "(每日)")
+    output_file = output_path / new_name
+
+    # 保存结果（列式输入保存为列式结果）
+    if file.suffix == ".parquet":
+        output_file = save_columnar(daily_avg, str(output_file))
+    else:
         daily_avg.to_excel(output_file, index=False)
-        print(f"已生成：{output_file}")
+    log_content.append(f"已生成：{output_file}")
+    return log_content
+
+
+def process_daily_average(input_folder, output_folder, max_workers=None):
+    # 创建输出文件夹
+    output_path = Path(input_folder) / output_folder
+    output_path.mkdir(exist_ok=True)
+
+    # 筛选输入文件夹中的每分钟数据文件（排序后处理，保证输出顺序固定）
+    files = sorted(
+        file
+        for pattern in ("*.xlsx", "*.parquet")
+        for file in Path(input_folder).glob(pattern)
+        if "(每分钟)" in file.name
+    )
+
+    # 多进程并行处理，日志与失败信息按文件顺序输出
+    failed = []
+    for file, file_log, error in run_batch(
+        average_file, files, output_path, max_workers=max_workers
+    ):
+        if error is not None:
+            print(f"{file.name}\n❌ 处理失败：{error}")
+            failed.append(file.name)
+            continue
+        print("\n".join(file_log))
 
     print("处理完成！")
+    if failed:
+        print(f"处理失败的文件：{', '.join(failed)}")
     print(f"输出文件夹路径：{output_path}")
 
 
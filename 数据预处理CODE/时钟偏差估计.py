@@ -0,0 +1,85 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import iter_table_chunks, save_columnar
+from 分块重采样 import resample_chunks
+from 时钟偏差 import window_offsets, daily_offsets
+
+# ================== 用户可调参数 ==================
+# 参考平台（时钟视为准确）与待校正平台：文件路径、时间列、需要的通道
+REFERENCE = {
+    "name": "CR1000X",
+    "path": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\CR1000X平均数据(每分钟).xlsx",
+    "time_col": "时间",
+}
+TARGET = {
+    "name": "锦州阳光",
+    "path": r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据\锦州阳光_温度相关_全30日数据(每分钟).xlsx",
+    "time_col": "时间 ()",
+}
+# 参与估计的通道对 (参考通道, 待校正通道)，各通道对在同一次 FFT 中计算
+PAIRS = [
+    ("CR温度2", "温度9 (℃)"),
+    ("CR温度1", "温度9 (℃)"),
+    ("CR温度2", "温度8 (℃)"),
+]
+CHUNK_ROWS = 50_000  # 每次读取的行数
+FREQ = "min"  # 公共网格间隔
+WINDOW = "6h"  # 互相关窗口长度
+STEP = "1h"  # 窗口滑动步长
+MAX_LAG = "30min"  # 搜索的最大偏差
+MIN_VALID = 0.8  # 窗口内有效数据的最低比例
+MIN_CORR = 0.3  # 参与每日汇总的最低峰值相关系数
+
+# 输出每日偏差表，合并温度链数据.py 中待校正平台的 offset 填写该路径即可
+output_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\锦州阳光时钟偏差(每日).parquet"
+# ================================================
+
+
+def load_grid(source, columns):
+    """流式读取指定通道并重采样到公共分钟网格，返回以时间为索引的表"""
+    time_col = source["time_col"]
+    chunks = (
+        chunk.rename(columns={time_col: "时间"}).assign(
+            时间=lambda d: pd.to_datetime(d["时间"])
+        )
+        for chunk in iter_table_chunks(
+            source["path"], usecols=[time_col, *columns], chunk_rows=CHUNK_ROWS
+        )
+    )
+    grid = pd.concat(resample_chunks(chunks, freq=FREQ), ignore_index=True)
+    return grid.set_index("时间")[columns]
+
+
+if __name__ == "__main__":
+    ref_cols = list(dict.fromkeys(p[0] for p in PAIRS))
+    target_cols = list(dict.fromkeys(p[1] for p in PAIRS))
+    ref = load_grid(REFERENCE, ref_cols)
+    target = load_grid(TARGET, target_cols)
+
+    # 只在两个平台的重叠时段内计算
+    common = ref.index.intersection(target.index)
+    if common.empty:
+        raise ValueError(f"{REFERENCE['name']} 与 {TARGET['name']} 没有重叠时段")
+    grid = pd.date_range(common[0], common[-1], freq=FREQ)
+    windows = window_offsets(
+        ref.reindex(grid),
+        target.reindex(grid),
+        PAIRS,
+        freq=FREQ,
+        window=WINDOW,
+        step=STEP,
+        max_lag=MAX_LAG,
+        min_valid=MIN_VALID,
+    )
+    daily, drift = daily_offsets(windows, min_corr=MIN_CORR)
+    if daily.empty:
+        raise ValueError("没有满足条件的窗口，请检查通道对或放宽 MIN_VALID / MIN_CORR")
+
+    saved_path = save_columnar(daily, output_path)
+    print(f"{TARGET['name']} 相对 {REFERENCE['name']} 的每日时钟偏差：")
+    print(daily.to_string(index=False))
+    print(f"时钟漂移：{drift:+.1f} 秒/天")
+    print(f"已保存至：{saved_path}")
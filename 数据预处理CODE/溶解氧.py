@@ -1,9 +1,14 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from matplotlib import font_manager
 from matplotlib.colors import LinearSegmentedColormap
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached
+from 热力图渲染 import render_heatmap
 
 # ================= 参数配置区域（用户可修改） =================
 SELECTED_COLS = [
@@ -29,7 +34,7 @@ if "Microsoft YaHei" not in font_manager.findSystemFonts():
 # 读取数据（注意路径验证）
 try:
     data_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x初始数据\CR100X处理后数据\CR1000X平均数据(每分钟).xlsx"
-    df = pd.read_excel(data_path)
+    df = read_excel_cached(data_path, usecols=["时间", *SELECTED_COLS])
 except FileNotFoundError:
     print(f"错误：文件未找到，请检查路径是否正确：{data_path}")
     exit()
@@ -48,19 +53,20 @@ cmap_custom = LinearSegmentedColormap.from_list("红蓝渐变", COLORS)
 
 # 绘制热力图
 plt.figure(figsize=(17, 9))
-ax = sns.heatmap(
+ax = plt.gca()
+# 按输出像素分辨率降采样后以图像绘制（代替逐单元格绘制的 sns.heatmap）
+image, cbar = render_heatmap(
+    ax,
     df_temp.T,
     cmap=cmap_custom,
+    vmin=VMIN,
+    vmax=VMAX,
     cbar_kws={
         "label": "溶解氧",
         "shrink": 0.8,
         "aspect": 20,
         "pad": 0.03,  # 减小颜色条与主图的间距
     },
-    vmin=VMIN,
-    vmax=VMAX,
-    yticklabels=1,
-    xticklabels=False,
 )
 
 # 设置坐标轴样式
@@ -82,7 +88,6 @@ for spine in ax.spines.values():
     spine.set_linewidth(1)
 
 # 设置颜色条样式
-cbar = ax.collections[0].colorbar
 cbar.outline.set_edgecolor("black")
 cbar.outline.set_linewidth(1)
 cbar.ax.tick_params(labelsize=12)
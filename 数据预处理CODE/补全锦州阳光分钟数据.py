@@ -1,9 +1,87 @@
 import pandas as pd
 import os
-from datetime import timedelta
-
-
-def process_all_files():
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached, save_columnar
+from 批量执行 import run_batch
+from 缺口插补 import complete_minute_grid
+
+# 补全参数（单位：分钟）
+FILL_RULES = [(5, "linear"), (30, "nearest")]  # 按缺口长度选择补全方式，更长的缺口不补
+DEFAULT_MAX_FILL = 30  # 各通道默认最大补全长度
+MAX_FILL = {}  # 单独设置的通道最大补全长度，如 {"温度1 (℃)": 10}
+
+
+def complete_file(file_name, input_dir, output_dir):
+    """补全单个文件（在子进程中执行），返回 (该文件的日志行, 输出路径或None)"""
+    file_path = os.path.join(input_dir, file_name)
+    base_name = os.path.basename(file_path)
+    log_content = [f"\n处理文件：{base_name}"]
+
+    try:
+        # 读取Excel文件
+        df = read_excel_cached(file_path, header=0)
+        original_time_col = df.columns[0]
+        df = df.rename(columns={original_time_col: "时间"})
+
+        # 处理空值
+        if df["时间"].isnull().any():
+            df = df.dropna(subset=["时间"])
+            log_content.append("⚠️ 时间列存在空值，已删除对应行")
+
+        # 时间格式处理（排序与去重由补全引擎在写入网格时完成）
+        df["时间"] = pd.to_datetime(df["时间"]).dt.floor("min")
+        original_count = df["时间"].nunique()
+        start_time = df["时间"].min()
+        end_time = df["时间"].max()
+
+        # 按缺口长度分档补全到完整分钟网格，同时得到补全标记
+        max_fill = {col: MAX_FILL.get(col, DEFAULT_MAX_FILL) for col in df.columns[1:]}
+        df_full, fill_mask = complete_minute_grid(
+            df, "时间", fill_rules=FILL_RULES, max_fill=max_fill
+        )
+        del df
+        filled_count = int(fill_mask.iloc[:, 1:].to_numpy().sum())
+        unfilled_count = int(df_full.iloc[:, 1:].isna().to_numpy().sum())
+
+        # 恢复原始列名
+        df_full = df_full.rename(columns={"时间": original_time_col})
+        fill_mask = fill_mask.rename(columns={"时间": original_time_col})
+
+        # 保存文件
+        output_name = f"{os.path.splitext(file_name)[0]}_补全.xlsx"
+        output_path = os.path.join(output_dir, output_name)
+        df_full.to_excel(output_path, index=False)
+        mask_path = save_columnar(
+            fill_mask,
+            os.path.join(
+                output_dir, f"{os.path.splitext(file_name)[0]}_补全标记.parquet"
+            ),
+        )
+
+        # 记录日志
+        log_content.extend(
+            [
+                f"✅ 处理成功",
+                f"时间范围：{start_time} 至 {end_time}",
+                f"原数据量：{original_count}条",
+                f"补全后数据量：{len(df_full)}条",
+                f"补全缺失点：{len(df_full)-original_count}处",
+                f"插补数值：{filled_count}个，超出补全长度保留为空：{unfilled_count}个",
+                f"保存路径：{output_path}",
+                f"补全标记：{mask_path}",
+            ]
+        )
+        return log_content, output_path
+
+    except Exception as e:
+        log_content.append(f"❌ 处理失败：{str(e)}")
+        return log_content, None
+
+
+def process_all_files(max_workers=None):
     # 配置路径
     input_dir = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据"
     output_dir = os.path.join(input_dir, "补全数据")
@@ -12,12 +90,12 @@ def process_all_files():
     # 创建输出目录
     os.makedirs(output_dir, exist_ok=True)
 
-    # 获取所有Excel文件
-    excel_files = [
+    # 获取所有Excel文件（排序后处理，保证日志顺序固定）
+    excel_files = sorted(
         f
         for f in os.listdir(input_dir)
         if f.endswith(".xlsx") and not f.startswith("~$")
-    ]
+    )
 
     if not excel_files:
         print("输入目录中没有Excel文件")
@@ -34,64 +112,18 @@ def process_all_files():
 
     processed_files = []
 
-    for file_name in excel_files:
-        file_path = os.path.join(input_dir, file_name)
-        base_name = os.path.basename(file_path)
-        log_content.append(f"\n处理文件：{base_name}")
-
-        try:
-            # 读取Excel文件
-            df = pd.read_excel(file_path, header=0)
-            original_time_col = df.columns[0]
-            df = df.rename(columns={original_time_col: "时间"})
-
-            # 处理空值
-            if df["时间"].isnull().any():
-                df = df.dropna(subset=["时间"])
-                log_content.append("⚠️ 时间列存在空值，已删除对应行")
-
-            # 时间格式处理
-            df["时间"] = pd.to_datetime(df["时间"]).dt.floor("T")
-            df = df.sort_values("时间").drop_duplicates(subset=["时间"], keep="first")
-
-            # 生成完整时间序列
-            start_time = df["时间"].min()
-            end_time = df["时间"].max()
-            full_range = pd.date_range(start=start_time, end=end_time, freq="T")
-
-            # 重新索引并插值
-            df_full = (
-                df.set_index("时间")
-                .reindex(full_range)
-                .interpolate(method="time")
-                .reset_index()
-                .rename(columns={"index": "时间"})
-            )
-
-            # 恢复原始列名
-            df_full = df_full.rename(columns={"时间": original_time_col})
-
-            # 保存文件
-            output_name = f"{os.path.splitext(file_name)[0]}_补全.xlsx"
-            output_path = os.path.join(output_dir, output_name)
-            df_full.to_excel(output_path, index=False)
-            processed_files.append(output_path)
-
-            # 记录日志
-            log_content.extend(
-                [
-                    f"✅ 处理成功",
-                    f"时间范围：{start_time} 至 {end_time}",
-                    f"原数据量：{len(df)}条",
-                    f"补全后数据量：{len(df_full)}条",
-                    f"补全缺失点：{len(df_full)-len(df)}处",
-                    f"保存路径：{output_path}",
-                ]
-            )
-
-        except Exception as e:
-            log_content.append(f"❌ 处理失败：{str(e)}")
+    # 多进程并行补全，结果按文件顺序合并到日志
+    outcomes = run_batch(
+        complete_file, excel_files, input_dir, output_dir, max_workers=max_workers
+    )
+    for file_name, result, error in outcomes:
+        if error is not None:
+            log_content.extend([f"\n处理文件：{file_name}", f"❌ 处理失败：{error}"])
             continue
+        file_log, output_path = result
+        log_content.extend(file_log)
+        if output_path is not None:
+            processed_files.append(output_path)
 
     # 写入日志文件
     with open(log_file, "w", encoding="utf-8") as f:
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached, save_columnar
+from 太阳几何 import solar_elevation
+
+# 辐射收支计算
+# 将短波（总辐射）和长波两个表按分钟网格对齐，一次性向量化计算反照率、
+# 净短波、净长波和净全波辐射，并积分得到每日辐照量 (MJ/m²)。
+
+# ================== 用户可调参数 ==================
+data_dir = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\锦州阳光数据\输出-锦州阳光数据\锦州阳光每分钟数据"
+SW_FILE = "锦州阳光_总辐射相关_全30日数据(每分钟).xlsx"
+LW_FILE = "锦州阳光_长波辐射相关_全30日数据(每分钟).xlsx"
+
+# 原始列名 → 分量名（1 号表为下行，2 号表为上行）
+SW_COLUMNS = {
+    "时间 ()": "时间",
+    "总辐射1瞬时 (W/㎡)": "下行短波(W/㎡)",
+    "总辐射2瞬时 (W/㎡)": "上行短波(W/㎡)",
+}
+LW_COLUMNS = {
+    "时间 ()": "时间",
+    "长波辐射1瞬时 (W/㎡)": "下行长波(W/㎡)",
+    "长波辐射2瞬时 (W/㎡)": "上行长波(W/㎡)",
+}
+
+ALBEDO_MIN_ELEVATION = 10.0  # 计算反照率的最低太阳高度角 (°)
+ALBEDO_MIN_SW = 20.0  # 计算反照率的最低下行短波 (W/㎡)
+
+# 输出到每分钟数据目录，提取每日平均数据.py 可直接读取
+MINUTE_OUTPUT = "锦州阳光_辐射收支_全30日数据(每分钟).parquet"
+DAILY_OUTPUT = "锦州阳光_辐射收支_全30日数据(每日辐照量).parquet"
+# ================================================
+
+FLUX_COLUMNS = [
+    "下行短波(W/㎡)",
+    "上行短波(W/㎡)",
+    "下行长波(W/㎡)",
+    "上行长波(W/㎡)",
+    "净短波(W/㎡)",
+    "净长波(W/㎡)",
+    "净全波(W/㎡)",
+]
+
+
+def load_minute_table(file_path, columns):
+    """读取辐射表，按分钟取整后以时间为索引（重复时间保留首条）"""
+    df = read_excel_cached(file_path, usecols=list(columns)).rename(columns=columns)
+    df["时间"] = pd.to_datetime(df["时间"]).dt.floor("min")
+    df = df.drop_duplicates("时间").set_index("时间").sort_index()
+    return df.apply(pd.to_numeric, errors="coerce")
+
+
+def join_minute_grid(*tables):
+    """将多个表对齐到覆盖全部数据的完整分钟网格"""
+    start = min(t.index.min() for t in tables)
+    end = max(t.index.max() for t in tables)
+    grid = pd.date_range(start, end, freq="min", name="时间")
+    return pd.concat([t.reindex(grid) for t in tables], axis=1)
+
+
+def radiation_budget(df):
+    """逐分钟计算太阳高度角、反照率和各项净辐射（向量化）"""
+    result = df.copy()
+    elevation = solar_elevation(df.index)
+    sw_down = df["下行短波(W/㎡)"].to_numpy()
+    sw_up = df["上行短波(W/㎡)"].to_numpy()
+
+    # 太阳高度角过低或下行短波过弱时，反照率不可靠
+    valid = (elevation >= ALBEDO_MIN_ELEVATION) & (sw_down >= ALBEDO_MIN_SW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        albedo = np.where(valid, sw_up / sw_down, np.nan)
+
+    result["太阳高度角(°)"] = elevation
+    result["反照率"] = albedo
+    result["净短波(W/㎡)"] = sw_down - sw_up
+    result["净长波(W/㎡)"] = df["下行长波(W/㎡)"] - df["上行长波(W/㎡)"]
+    result["净全波(W/㎡)"] = result["净短波(W/㎡)"] + result["净长波(W/㎡)"]
+    return result
+
+
+def daily_totals(budget):
+    """每日辐照量 (MJ/㎡)：日均通量 × 86400 s，并给出各分量的有效分钟数
+
+    日反照率取有效时段上行、下行短波日总量之比，而不是逐分钟反照率的平均。
+    """
+    day_codes, days = pd.factorize(budget.index.floor("D"), sort=True)
+    n_days = len(days)
+    daily = {"日期": days}
+
+    for col in FLUX_COLUMNS:
+        values = budget[col].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        counts = np.bincount(day_codes[valid], minlength=n_days)
+        sums = np.bincount(day_codes[valid], weights=values[valid], minlength=n_days)
+        with np.errstate(invalid="ignore"):
+            daily[col.replace("(W/㎡)", "(MJ/㎡)")] = sums / counts * 86400 / 1e6
+        daily[col.replace("(W/㎡)", "有效分钟数")] = counts
+
+    # 日反照率
+    mask = ~np.isnan(budget["反照率"].to_numpy())
+    up = np.bincount(
+        day_codes[mask],
+        weights=budget["上行短波(W/㎡)"].to_numpy()[mask],
+        minlength=n_days,
+    )
+    down = np.bincount(
+        day_codes[mask],
+        weights=budget["下行短波(W/㎡)"].to_numpy()[mask],
+        minlength=n_days,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily["日反照率"] = np.where(down > 0, up / down, np.nan)
+    return pd.DataFrame(daily)
+
+
+def process_radiation_budget():
+    """主处理函数：读取两个辐射表、计算辐射收支并保存逐分钟和每日结果"""
+    sw = load_minute_table(Path(data_dir) / SW_FILE, SW_COLUMNS)
+    lw = load_minute_table(Path(data_dir) / LW_FILE, LW_COLUMNS)
+    budget = radiation_budget(join_minute_grid(sw, lw))
+    print("数据时间范围:", budget.index.min(), "至", budget.index.max())
+
+    minute_path = save_columnar(
+        budget.reset_index(), str(Path(data_dir) / MINUTE_OUTPUT)
+    )
+    daily = daily_totals(budget)
+    daily_path = save_columnar(daily, str(Path(data_dir) / DAILY_OUTPUT))
+
+    print(f"逐分钟辐射收支已保存至：{minute_path}")
+    print(f"每日辐照量已保存至：{daily_path}")
+    summary = daily.set_index("日期")[
+        ["净短波(MJ/㎡)", "净长波(MJ/㎡)", "净全波(MJ/㎡)", "日反照率"]
+    ]
+    print(summary.round(3).to_string())
+
+
+if __name__ == "__main__":
+    process_radiation_budget()
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_table_cached, save_columnar, CACHE_DIR_NAME
+from 温度链插值 import interpolate_profiles_cached, chunk_rows
+
+# ================= 参数配置区域 =================
+# 传感器布置与插值参数与 全温度链.py 保持一致，可直接复用其插值缓存
+SELECTED_COLS = [
+    "CR温度1",
+    "CR温度2",
+    "温度9 (℃)",
+    "温度8 (℃)",
+    "温度7 (℃)",
+    "温度6 (℃)",
+    "温度5 (℃)",
+    "温度4 (℃)",
+    "温度3 (℃)",
+    "温度2 (℃)",
+    "温度1 (℃)",
+]
+DEPTHS = [-0, -0.2, -0.4, -0.6, -0.8, -1, -1.2, -1.4, -1.6, -1.8, -2]  # 单位：米
+INTERP_DEPTH_STEP = 0.01  # 插值步长 (米)
+INTERP_KIND = "quadratic"  # 插值方式：linear / quadratic / cubic
+INTERP_MAX_MEMORY_MB = 256  # 分块计算的峰值内存 (MB)
+
+FREEZING_ISOTHERM = 0.0  # 冰水界面对应的等温线 (℃)
+ISOTHERMS = [0.0, -2.0, -5.0]  # 需要追踪的等温线 (℃)
+GROWTH_SMOOTH_WINDOW = "6h"  # 计算增长率前对界面深度的平滑窗口
+
+data_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\逐分钟温度链数据(2.9) 修复温度5.xlsx"
+output_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\冰水界面追踪结果.parquet"
+# ===============================================
+
+
+def isotherm_depths(grid, new_depths, isotherm, max_memory_mb=256):
+    """逐时间点求等温线深度（向量化线性求根）
+
+    grid 为 (时间, 插值深度) 矩阵，new_depths 自上而下排列。
+    在每条廓线上寻找“上冷下暖”（由 < isotherm 变为 ≥ isotherm）的最深一次穿越，
+    在该区间内线性插值得到穿越深度；没有穿越的时间点为 NaN。
+    """
+    new_depths = np.asarray(new_depths, dtype=float)
+    result = np.full(len(grid), np.nan)
+    step = chunk_rows(grid.shape[1], max_memory_mb)
+
+    for start in range(0, len(grid), step):
+        diff = np.asarray(grid[start : start + step], dtype=float) - isotherm
+        crossing = (diff[:, :-1] < 0) & (diff[:, 1:] >= 0)
+        found = crossing.any(axis=1)
+
+        # 最深一次穿越所在的区间序号
+        k = crossing.shape[1] - 1 - np.argmax(crossing[:, ::-1], axis=1)
+        rows = np.arange(len(diff))
+        upper, lower = diff[rows, k], diff[rows, k + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):  # 无穿越的行
+            frac = upper / (upper - lower)
+        depth = new_depths[k] + frac * (new_depths[k + 1] - new_depths[k])
+        result[start : start + len(diff)] = np.where(found, depth, np.nan)
+    return result
+
+
+def growth_rate(thickness, smooth_window=GROWTH_SMOOTH_WINDOW):
+    """由冰厚序列计算增长率 (cm/天)：先按时间窗平滑，再对时间求导"""
+    smoothed = thickness.rolling(smooth_window, min_periods=1, center=True).mean()
+    days = (thickness.index - thickness.index[0]) / pd.Timedelta(days=1)
+    valid = smoothed.notna().to_numpy()
+    rate = np.full(len(thickness), np.nan)
+    if valid.sum() > 1:
+        rate[valid] = np.gradient(smoothed.to_numpy()[valid], days[valid]) * 100
+    return pd.Series(rate, index=thickness.index)
+
+
+def track_interfaces(df_temp, new_depths, grid):
+    """计算各等温线深度时间序列、冰厚估计和冰厚增长率"""
+    result = pd.DataFrame(index=df_temp.index)
+    for iso in dict.fromkeys([FREEZING_ISOTHERM, *ISOTHERMS]):
+        result[f"{iso:g}℃等温线深度(m)"] = isotherm_depths(
+            grid, new_depths, iso, INTERP_MAX_MEMORY_MB
+        )
+
+    result["冰厚估计(m)"] = -result[f"{FREEZING_ISOTHERM:g}℃等温线深度(m)"]
+    result["冰厚增长率(cm/天)"] = growth_rate(result["冰厚估计(m)"])
+    return result
+
+
+def main():
+    # 读取数据
+    df = read_table_cached(data_path, usecols=["时间", *SELECTED_COLS])
+    df["时间"] = pd.to_datetime(df["时间"])
+    df_temp = df.set_index("时间")[SELECTED_COLS].astype(float)
+
+    # 深度插值（与热力图脚本共用缓存）
+    new_depths = np.arange(
+        DEPTHS[0], DEPTHS[-1] - INTERP_DEPTH_STEP, -INTERP_DEPTH_STEP
+    )
+    grid = interpolate_profiles_cached(
+        df_temp,
+        DEPTHS,
+        new_depths,
+        kind=INTERP_KIND,
+        cache_dir=Path(data_path).parent / CACHE_DIR_NAME,
+        max_memory_mb=INTERP_MAX_MEMORY_MB,
+    )
+
+    result = track_interfaces(df_temp, new_depths, grid)
+    saved_path = save_columnar(result.reset_index(), output_path)
+
+    print(f"冰水界面追踪结果已保存至：{saved_path}")
+    print(f"有效时间点：{result['冰厚估计(m)'].notna().sum()}/{len(result)}")
+    print("每日冰厚估计 (m)：")
+    print(result["冰厚估计(m)"].resample("D").mean().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
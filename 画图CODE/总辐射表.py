@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib.dates as mdates
 from matplotlib.ticker import MultipleLocator
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached
+from 折线渲染 import render_line
+from 太阳几何 import add_daylight
 
 # ================= 全局配置 =================
 plt.rcParams.update(
@@ -27,6 +33,7 @@ COLUMN_SETTINGS = {
 STYLE_CONFIG = {
     "colors": ["#E63946", "#1D3557"],
     "linewidth": 0.8,
+    "downsample": "minmax",  # 折线降采样方式：minmax（包络）/ lttb
     "date_range": {
         "start": "2025-01-18 00:00:00",
         "end": "2025-02-17 00:00:00",
@@ -37,7 +44,7 @@ STYLE_CONFIG = {
 # ================= 数据预处理 =================
 def load_and_process(filepath):
     # 读取Excel文件
-    df = pd.read_excel(filepath)
+    df = read_excel_cached(filepath, usecols=list(COLUMN_SETTINGS))
     # 重命名列名
     df = df.rename(columns=COLUMN_SETTINGS)
     # 将时间列转换为datetime类型
@@ -68,21 +75,23 @@ def create_visualization(df):
     )
 
     # 绘制第一个子图（辐射1）
-    sns.lineplot(
-        data=df["辐射1"],
+    render_line(
+        ax1,
+        df["辐射1"],
         color=STYLE_CONFIG["colors"][0],
         linewidth=STYLE_CONFIG["linewidth"],
         alpha=0.85,
-        ax=ax1,
+        method=STYLE_CONFIG["downsample"],
     )
 
     # 绘制第二个子图（辐射2）
-    sns.lineplot(
-        data=df["辐射2"],
+    render_line(
+        ax2,
+        df["辐射2"],
         color=STYLE_CONFIG["colors"][1],
         linewidth=STYLE_CONFIG["linewidth"],
         alpha=0.85,
-        ax=ax2,
+        method=STYLE_CONFIG["downsample"],
     )
 
     # ================= 公共配置函数 =================
@@ -128,21 +137,16 @@ def create_visualization(df):
     ax2.set_ylabel("上行瞬时总辐射 (W/㎡)", fontsize=14, labelpad=18)
 
     # ================= 背景色配置 =================
-    def add_daylight(ax):
-        for day in pd.date_range(
-            start=STYLE_CONFIG["date_range"]["start"],
-            end=STYLE_CONFIG["date_range"]["end"],
-        ):
-            ax.axvspan(
-                day + pd.Timedelta(hours=6),
-                day + pd.Timedelta(hours=18),
-                facecolor="gold",
-                alpha=0.06,
-                zorder=0,
-            )
-
-    add_daylight(ax1)
-    add_daylight(ax2)
+    # 按观测站实际日出日落时间绘制白天底色
+    for ax in (ax1, ax2):
+        add_daylight(
+            ax,
+            STYLE_CONFIG["date_range"]["start"],
+            STYLE_CONFIG["date_range"]["end"],
+            facecolor="gold",
+            alpha=0.06,
+            zorder=0,
+        )
 
     # 调整子图间距
     plt.subplots_adjust(hspace=0.08)
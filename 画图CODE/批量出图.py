@@ -0,0 +1,194 @@
+import ast
+import hashlib
+import json
+import os
+import runpy
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # 子进程继承，无界面渲染
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 批量执行 import run_batch
+
+# 批量出图
+# 以 Agg 后端在进程池中运行各绘图脚本，把脚本结束时打开的全部图窗保存为 PNG/PDF。
+# 每张图记录“脚本及其导入的本地模块源码 + 输出配置 + 输入数据内容”的哈希，
+# 均未改变且输出文件齐全时跳过重绘，修正少量数据后只重绘受影响的图。
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_DIRS = [ROOT / "工具类CODE", ROOT / "画图CODE"]  # 脚本可导入的本地模块目录
+
+# ================= 参数配置区域 =================
+# 图名 → (绘图脚本, 脚本中保存输入数据路径的变量名)
+FIGURES = {
+    "全温度链": ("画图CODE/全温度链.py", ["data_path"]),
+    "温度链热力图7-1": ("画图CODE/温度链热力图7-1.py", ["data_path"]),
+    "温度链热力图前80": ("画图CODE/温度链热力图前80 copy.py", ["data_path"]),
+    "总辐射表": ("画图CODE/总辐射表.py", ["DATA_FILE"]),
+    "长波辐射表": ("画图CODE/长波辐射表.py", ["DATA_FILE"]),
+    "高度计散点图": ("画图CODE/高度计散点图.py", ["FILE_PATH"]),
+    "溶解氧": ("数据预处理CODE/溶解氧.py", ["data_path"]),
+}
+OUTPUT_DIR = r"S:\STU-DATA\兴凯湖实地数据\处理结果\批量出图"
+OUTPUT_FORMATS = ["png", "pdf"]
+DPI = 200
+# ===============================================
+
+RECORD_FILE = "出图记录.json"
+HASH_BLOCK = 1 << 20  # 计算文件哈希时每次读取的字节数
+
+
+def input_paths(script, names):
+    """从脚本源码中找出指定变量名赋值的字符串常量（包括 try 等语句块内的赋值）"""
+    tree = ast.parse(Path(script).read_text(encoding="utf-8"))
+    paths = []
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+            and any(isinstance(t, ast.Name) and t.id in names for t in node.targets)
+        ):
+            paths.append(node.value.value)
+    return paths
+
+
+def local_modules(script):
+    """脚本直接或间接导入的本地模块文件（工具类CODE、画图CODE 及脚本所在目录）"""
+    script = Path(script)
+    dirs = [script.parent, *MODULE_DIRS]
+    found, pending = set(), [script]
+    while pending:
+        tree = ast.parse(pending.pop().read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                top = module.split(".")[0]
+                for directory in dirs:
+                    path = directory / f"{top}.py"
+                    if path.exists() and path != script:
+                        if path not in found:
+                            found.add(path)
+                            pending.append(path)
+                        break
+    return sorted(found)
+
+
+def figure_hash(script, names, dpi=DPI, formats=OUTPUT_FORMATS):
+    """图的内容哈希：脚本源码（含全部配置参数）+ 导入的本地模块源码
+    + 输出分辨率和格式 + 各输入数据文件的内容"""
+    digest = hashlib.sha1(Path(script).read_bytes())
+    for module in local_modules(script):
+        digest.update(module.name.encode("utf-8"))
+        digest.update(module.read_bytes())
+    digest.update(repr((dpi, sorted(formats))).encode("utf-8"))
+    for path in input_paths(script, names):
+        digest.update(path.encode("utf-8"))
+        with open(path, "rb") as f:
+            while block := f.read(HASH_BLOCK):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def output_files(name, count, output_dir=OUTPUT_DIR, formats=OUTPUT_FORMATS):
+    """第 1 张图为 “图名.格式”，其余为 “图名_2.格式” 等"""
+    stems = [name] + [f"{name}_{i}" for i in range(2, count + 1)]
+    return [Path(output_dir) / f"{stem}.{fmt}" for stem in stems for fmt in formats]
+
+
+def render_figure(name, previous, output_dir, formats, dpi):
+    """渲染一张图（在子进程中执行），返回 (状态, 哈希, 输出文件列表)"""
+    script, names = FIGURES[name]
+    script = ROOT / script
+    current = figure_hash(script, names, dpi, formats)
+    if previous and previous["hash"] == current and "figures" in previous:
+        expected = output_files(name, previous["figures"], output_dir, formats)
+        if set(map(str, expected)) == set(previous["files"]) and all(
+            p.exists() for p in expected
+        ):
+            return "跳过", current, previous["files"]
+
+    # 进程池中的子进程会被复用：脚本对 rcParams 的修改只在本次运行内有效，
+    # 保存时字体等设置仍需生效，因此保存也在 rc_context 内完成
+    plt.close("all")
+    show = plt.show
+    plt.show = lambda *args, **kwargs: None  # 屏蔽 plt.show()，运行结束后保存所有图窗
+    try:
+        with plt.rc_context({"savefig.dpi": dpi}):
+            try:
+                runpy.run_path(str(script), run_name="__main__")
+            except SystemExit as e:
+                raise RuntimeError(f"脚本提前退出：{e}") from None
+
+            figures = [plt.figure(num) for num in plt.get_fignums()]
+            if not figures:
+                raise RuntimeError("脚本没有生成图窗")
+            files = output_files(name, len(figures), output_dir, formats)
+            for i, fig in enumerate(figures):
+                for fmt in formats:
+                    fig.savefig(files[i * len(formats) + formats.index(fmt)], dpi=dpi)
+    finally:
+        plt.show = show
+        plt.close("all")
+    return "已渲染", current, [str(p) for p in files]
+
+
+def _render_task(task, output_dir):
+    """run_batch 的子进程入口"""
+    name, previous = task
+    return render_figure(name, previous, output_dir, OUTPUT_FORMATS, DPI)
+
+
+def render_all(names=None, output_dir=OUTPUT_DIR, force=False, max_workers=None):
+    """并行渲染指定的图（默认全部），内容未改变的图直接跳过"""
+    names = list(FIGURES) if names is None else list(names)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    record_path = output_dir / RECORD_FILE
+    record = (
+        json.loads(record_path.read_text(encoding="utf-8"))
+        if record_path.exists()
+        else {}
+    )
+
+    tasks = [(name, None if force else record.get(name)) for name in names]
+    failed = []
+    for (name, _), outcome, error in run_batch(
+        _render_task, tasks, str(output_dir), max_workers=max_workers
+    ):
+        if error is not None:
+            print(f"❌ {name}：{error}")
+            failed.append(name)
+            continue
+        status, digest, files = outcome
+        record[name] = {
+            "hash": digest,
+            "files": files,
+            "figures": len(files) // len(OUTPUT_FORMATS),
+        }
+        print(f"{status}：{name}（{len(files)} 个文件）")
+
+    # 先写临时文件再替换，中断时不会留下不完整的记录
+    fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix="出图记录.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_name, record_path)
+    if failed:
+        print(f"渲染失败的图：{', '.join(failed)}")
+    print(f"输出文件夹路径：{output_dir}")
+
+
+if __name__ == "__main__":
+    render_all()
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_table_cached, save_columnar, read_columnar, CACHE_DIR_NAME
+from 温度链插值 import interpolate_profiles_cached, chunk_rows
+from 冰水界面追踪 import (
+    SELECTED_COLS,
+    DEPTHS,
+    INTERP_DEPTH_STEP,
+    INTERP_KIND,
+    INTERP_MAX_MEMORY_MB,
+    FREEZING_ISOTHERM,
+    isotherm_depths,
+)
+
+# 温度梯度与传导热通量
+# 在插值网格上沿深度做中心差分得到 dT/dz，再按冰水界面分别取冰、水的导热系数，
+# 计算传导热通量 F = -k·dT/dz（z 向上为正，F > 0 表示热量向上传导）。
+# 逐分钟结果按深度列保存为列式文件，可直接用 render_heatmap 绘制，无需在绘图脚本中重算。
+
+# ================= 参数配置区域 =================
+K_ICE = 2.2  # 冰的导热系数 (W/m/K)
+K_WATER = 0.56  # 水的导热系数 (W/m/K)
+
+data_path = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\逐分钟温度链数据(2.9) 修复温度5.xlsx"
+output_dir = (
+    r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\两个平台结合后的数据\温度梯度热通量"
+)
+# ===============================================
+
+GRADIENT_FILE = "温度梯度_每分钟.parquet"
+FLUX_FILE = "传导热通量_每分钟.parquet"
+DAILY_FILE = "温度梯度热通量_每日.parquet"
+
+
+def depth_decimals(step=INTERP_DEPTH_STEP):
+    """深度列名保留的小数位数：至少 2 位，并足以区分相邻的插值深度"""
+    decimals = 2
+    while abs(round(step, decimals) - step) > 1e-9 and decimals < 6:
+        decimals += 1
+    return decimals
+
+
+def depth_label(depth, decimals=None):
+    """深度列名，如 -0.35 → "-0.35m"；小数位数默认由 INTERP_DEPTH_STEP 决定"""
+    decimals = depth_decimals() if decimals is None else decimals
+    return f"{depth:.{decimals}f}m"
+
+
+def depth_labels(new_depths):
+    """全部插值深度的列名，出现重复时报错（重复列名无法保存为 Parquet）"""
+    labels = [depth_label(d) for d in new_depths]
+    if len(set(labels)) < len(labels):
+        raise ValueError(
+            "插值深度的列名重复，请检查 INTERP_DEPTH_STEP 与 depth_decimals"
+        )
+    return labels
+
+
+def gradient_and_flux(grid, new_depths, interface, max_memory_mb=256):
+    """分块计算 (时间, 插值深度) 的温度梯度 (℃/m) 和传导热通量 (W/m²)，均为 float32
+
+    interface 为每个时间点的冰水界面深度，界面以上（含界面）为冰，以下为水；
+    未找到界面的时间点按各深度温度是否低于冰点判断冰、水。
+    """
+    new_depths = np.asarray(new_depths, dtype=float)
+    gradient = np.empty(grid.shape, dtype=np.float32)
+    flux = np.empty(grid.shape, dtype=np.float32)
+    step = chunk_rows(grid.shape[1], max_memory_mb)
+
+    for start in range(0, len(grid), step):
+        chunk = np.asarray(grid[start : start + step], dtype=float)
+        rows = slice(start, start + len(chunk))
+        grad = np.gradient(chunk, new_depths, axis=1)
+
+        bottom = interface[rows, None]
+        is_ice = np.where(
+            np.isnan(bottom), chunk < FREEZING_ISOTHERM, new_depths >= bottom
+        )
+        gradient[rows] = grad
+        flux[rows] = -np.where(is_ice, K_ICE, K_WATER) * grad
+    return gradient, flux
+
+
+def daily_means(times, values):
+    """按自然日对 (时间, 深度) 矩阵求均值（忽略 NaN），返回 (日期, 日均矩阵)"""
+    day_codes, days = pd.factorize(pd.DatetimeIndex(times).floor("D"), sort=True)
+    sums = np.zeros((len(days), values.shape[1]))
+    counts = np.zeros((len(days), values.shape[1]))
+
+    # 时间有序，每天的数据连续，用 reduceat 一次求出各天的和与计数
+    starts = np.flatnonzero(np.diff(day_codes, prepend=-1))
+    valid = ~np.isnan(values)
+    sums[day_codes[starts]] = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    counts[day_codes[starts]] = np.add.reduceat(valid, starts)
+    with np.errstate(invalid="ignore"):
+        return days, sums / counts
+
+
+def to_frame(times, new_depths, values):
+    """(时间, 深度) 矩阵 → 首列为时间、其余列为各深度的表"""
+    frame = pd.DataFrame(values, columns=depth_labels(new_depths), copy=False)
+    frame.insert(0, "时间", times)
+    return frame
+
+
+def load_product(file_name, directory=output_dir):
+    """读取保存的逐分钟产品，返回 (时间, 深度, (时间, 深度) 矩阵)，用于 render_heatmap"""
+    frame = read_columnar(str(Path(directory) / file_name))
+    depths = np.array([float(c[:-1]) for c in frame.columns[1:]])
+    return pd.DatetimeIndex(frame["时间"]), depths, frame.iloc[:, 1:].to_numpy()
+
+
+def main():
+    # 读取数据
+    df = read_table_cached(data_path, usecols=["时间", *SELECTED_COLS])
+    df["时间"] = pd.to_datetime(df["时间"])
+    df_temp = df.set_index("时间")[SELECTED_COLS].astype(float)
+
+    # 深度插值（与热力图脚本共用缓存）
+    new_depths = np.arange(
+        DEPTHS[0], DEPTHS[-1] - INTERP_DEPTH_STEP, -INTERP_DEPTH_STEP
+    )
+    grid = interpolate_profiles_cached(
+        df_temp,
+        DEPTHS,
+        new_depths,
+        kind=INTERP_KIND,
+        cache_dir=Path(data_path).parent / CACHE_DIR_NAME,
+        max_memory_mb=INTERP_MAX_MEMORY_MB,
+    )
+
+    interface = isotherm_depths(
+        grid, new_depths, FREEZING_ISOTHERM, INTERP_MAX_MEMORY_MB
+    )
+    gradient, flux = gradient_and_flux(
+        grid, new_depths, interface, INTERP_MAX_MEMORY_MB
+    )
+
+    # 保存逐分钟结果
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    times = df_temp.index
+    for file_name, values in ((GRADIENT_FILE, gradient), (FLUX_FILE, flux)):
+        saved_path = save_columnar(
+            to_frame(times, new_depths, values), str(Path(output_dir) / file_name)
+        )
+        print(f"已保存：{saved_path}")
+
+    # 每日统计：各深度的日均梯度、日均热通量，以及冰水界面深度
+    days, daily_gradient = daily_means(times, gradient)
+    _, daily_flux = daily_means(times, flux)
+    _, daily_interface = daily_means(times, interface[:, None])
+    daily = pd.concat(
+        [
+            pd.DataFrame({"日期": days, "冰水界面深度(m)": daily_interface[:, 0]}),
+            pd.DataFrame(
+                daily_gradient,
+                columns=[f"梯度(℃/m)_{label}" for label in depth_labels(new_depths)],
+            ),
+            pd.DataFrame(
+                daily_flux,
+                columns=[f"热通量(W/m²)_{label}" for label in depth_labels(new_depths)],
+            ),
+        ],
+        axis=1,
+    )
+    saved_path = save_columnar(daily, str(Path(output_dir) / DAILY_FILE))
+    print(f"已保存：{saved_path}")
+
+
+if __name__ == "__main__":
+    main()
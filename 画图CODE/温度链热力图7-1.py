@@ -1,11 +1,16 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from scipy import interpolate
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.ticker import MultipleLocator  # 新增刻度控制
 from matplotlib.ticker import AutoMinorLocator  # 新增导入语句
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_table_cached, CACHE_DIR_NAME
+from 热力图渲染 import render_heatmap
+from 温度链插值 import interpolate_profiles_cached
 
 # ================= 参数配置区域 =================
 
@@ -17,7 +22,7 @@ plt.rcParams["font.sans-serif"] = ["Microsoft YaHei"]
 data_path = (
     r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\逐分钟温度链数据(2.9) 修复温度5.xlsx"
 )
-df = pd.read_excel(data_path)
+df = read_table_cached(data_path)
 SELECTED_COLS = [
     "温度7 (℃)",
     "温度6 (℃)",
@@ -32,6 +37,8 @@ VMAX = 4.5
 
 DEPTHS = [-0.8, -1, -1.2, -1.4, -1.6, -1.8, -2]  # 单位：米
 INTERP_DEPTH_STEP = 0.001  # 插值步长 (米)
+INTERP_KIND = "cubic"  # 插值方式：linear / quadratic / cubic
+INTERP_MAX_MEMORY_MB = 256  # 分块插值的峰值内存 (MB)
 
 TICK_STEP = 0.5  # 颜色条主刻度间隔 (℃)
 DATE_TICKS = 8  # 日期刻度数量
@@ -77,24 +84,18 @@ df_temp = df[SELECTED_COLS].copy().astype(float)
 
 # 创建插值后的深度序列
 new_depths = np.arange(DEPTHS[0], DEPTHS[-1] - INTERP_DEPTH_STEP, -INTERP_DEPTH_STEP)
-interp_matrix = []
-
-# 对每个时间点进行三次样条插值
-for timestamp in df_temp.index:
-    depths_sorted = sorted(DEPTHS)
-    values_sorted = [df_temp.loc[timestamp, col] for col in reversed(SELECTED_COLS)]
-    f = interpolate.interp1d(
-        depths_sorted, values_sorted, kind="cubic", fill_value="extrapolate"
-    )
-    interp_values = f(new_depths)
-    interp_matrix.append(interp_values)
-
-# 构建插值后的DataFrame
-df_interp = pd.DataFrame(
-    np.array(interp_matrix).T,
-    index=[f"{abs(d)*100:.0f}cm" for d in new_depths],
-    columns=df_temp.index,
-).T
+
+# 对所有时间点一次性进行三次样条插值（插值算子只依赖深度，预计算一次）
+# 结果按 数据+SELECTED_COLS+DEPTHS+步长+插值方式 缓存，只改绘图参数时直接复用
+interp_values = interpolate_profiles_cached(
+    df_temp,
+    DEPTHS,
+    new_depths,
+    kind=INTERP_KIND,
+    cache_dir=Path(data_path).parent / CACHE_DIR_NAME,
+    max_memory_mb=INTERP_MAX_MEMORY_MB,
+)
+
 # ===================================#
 # 创建自定义颜色映射
 temp_range = VMAX - VMIN
@@ -106,19 +107,20 @@ cmap_custom = LinearSegmentedColormap.from_list(
 # ===================================#
 # 绘制热力图
 plt.figure(figsize=(17, 9))
-ax = sns.heatmap(
-    df_interp.T,
+ax = plt.gca()
+# 按输出像素分辨率降采样后以图像绘制（代替逐单元格绘制的 sns.heatmap）
+image, cbar = render_heatmap(
+    ax,
+    interp_values.T,
     cmap=cmap_custom,
+    vmin=VMIN,
+    vmax=VMAX,
     cbar_kws={
         "label": "温度 (℃)",
         "shrink": 0.8,
         "aspect": 20,
         "pad": 0.03,
     },
-    vmin=VMIN,
-    vmax=VMAX,
-    yticklabels=False,
-    xticklabels=False,
 )
 # ===================================#
 # 设置坐标轴标签
@@ -150,8 +152,9 @@ for spine in ax.spines.values():
     spine.set_linewidth(1)
 
 # 设置日期刻度
-date_positions = np.linspace(0, len(df_interp) - 1, DATE_TICKS, dtype=int)
-date_labels = [df_interp.index[i].strftime("%y/%m/%d") for i in date_positions]
+date_positions = np.linspace(0, len(interp_values) - 1, DATE_TICKS, dtype=int)
+# 只为显示的刻度生成标签
+date_labels = [df_temp.index[i].strftime("%y/%m/%d") for i in date_positions]
 ax.set_xticks(date_positions)
 ax.set_xticklabels(date_labels, rotation=0, ha="center", fontsize=12)
 
@@ -161,7 +164,6 @@ ax.tick_params(axis="x", pad=SPACING["xtick_pad"])
 ax.tick_params(axis="y", pad=SPACING["ytick_pad"])
 
 # ================设置颜色图例条样式================#
-cbar = ax.collections[0].colorbar
 cbar.outline.set_edgecolor("black")
 cbar.outline.set_linewidth(1)
 cbar.ax.tick_params(labelsize=12, pad=SPACING["cbar_tick_pad"])
@@ -1,8 +1,13 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
 from matplotlib.ticker import AutoMinorLocator, MultipleLocator
 import matplotlib.dates as mdates
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "工具类CODE"))
+from 表格缓存 import read_excel_cached
+from 高度计参数扫描 import denoise_with_median, smooth_daily, sweep
 
 plt.rcParams["font.family"] = "sans-serif"
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei"]
@@ -17,117 +22,147 @@ START_DATE = "2025-01-18"  # 绘图起始时间
 END_DATE = "2025-02-18"  # 绘图结束时间
 OUTPUT_PATH = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\日均值数据.csv"  # 日均值数据导出路径
 
+
+# 参数扫描（SWEEP_MODE = True 时并行评估所有参数组合并输出对比表，不绘图）
+SWEEP_MODE = False
+SWEEP_THRESHOLDS = [0.05, 0.1, 0.15, 0.2]  # 阈值
+SWEEP_WINDOW_SIZES = [360, 720, 1400, 2880]  # 滑动平均窗口（分钟）
+SWEEP_DENOISE_WINDOWS = [1440, 2880, 4800]  # 降噪滑动中位数窗口（分钟）
+SWEEP_OUTPUT_PATH = r"S:\STU-DATA\兴凯湖实地数据\2025.1.18-2.16\cr1000x数据\CR1000X处理后数据\降噪参数扫描结果.csv"
+
+
 # 读取数据
-df = pd.read_excel(FILE_PATH)
-df[TIME_COL] = pd.to_datetime(df[TIME_COL])
-df = df.set_index(TIME_COL).sort_index()
+def load_data():
+    df = read_excel_cached(FILE_PATH, usecols=[TIME_COL, DATA_COL])
+    df[TIME_COL] = pd.to_datetime(df[TIME_COL])
+    return df.set_index(TIME_COL).sort_index()
 
 
 # 数据降噪处理
 def denoise_data(series, threshold, window_size=4800):
-    processed = series.copy()
     rolling_median = series.rolling(
         window=window_size, min_periods=1
     ).median()  # 滑动中位数
-    valid_range = (rolling_median * (1 - threshold), rolling_median * (1 + threshold))
-    mask = series.between(*valid_range)
-    processed.loc[~mask] = np.nan
-    return processed
-
-
-processed = denoise_data(df[DATA_COL], THRESHOLD)
-
-# 滑动平均处理
-processed_filled = processed.interpolate()  # 线性插值填充缺失值
-sma = processed_filled.rolling(window=WINDOW_SIZE, min_periods=1).mean()
-
-# 将滑动平均结果按天重新采样并计算日均值
-sma_daily = sma.resample("D").mean()
-
-# 时间范围筛选
-df_filtered = df.loc[START_DATE:END_DATE]
-processed_filtered = processed.loc[START_DATE:END_DATE]
-sma_filtered = sma.loc[START_DATE:END_DATE]
-sma_daily_filtered = sma_daily.loc[START_DATE:END_DATE]
-
-# 导出日均值数据
-sma_daily_filtered.to_csv(
-    OUTPUT_PATH, index=True, encoding="utf-8-sig"
-)  # 导出为 CSV 文件
-print(f"日均值数据已导出至：{OUTPUT_PATH}")
-
-# 绘图设置
-plt.figure(figsize=(14, 7), dpi=100)
-ax = plt.gca()
-
-# 绘制原始数据（散点图）
-ax.scatter(
-    df_filtered.index,
-    df_filtered[DATA_COL],
-    color="#D3D3D3",
-    s=10,
-    alpha=0.7,
-    label="原始数据",
-)
-
-# 绘制处理数据（散点图）
-ax.scatter(
-    processed_filtered.index,
-    processed_filtered,
-    color="#FF4500",
-    s=15,
-    label=f"降噪数据（阈值{THRESHOLD*100:.0f}%）",
-)
-
-# 绘制滑动平均（折线图，保持为折线以显示趋势）
-ax.plot(
-    sma_filtered.index,
-    sma_filtered,
-    color="#1E90FF",
-    linewidth=1.5,
-    label=f"滑动平均（{WINDOW_SIZE}分钟窗口）",
-)
-
-# 绘制滑动平均的日均值（折线图）
-ax.plot(
-    sma_daily_filtered.index,
-    sma_daily_filtered,
-    color="#2E8B57",  # 使用绿色表示日均值
-    linewidth=2,
-    linestyle="--",
-    label="滑动平均的日均值",
-)
-
-# 纵坐标设置
-ax.set_ylim(0, 0.5)
-ax.yaxis.set_major_locator(MultipleLocator(0.1))  # 主刻度每0.1
-ax.yaxis.set_minor_locator(MultipleLocator(0.02))  # 次刻度每0.02
-ax.yaxis.set_major_formatter("{x:.2f}")  # 保留两位小数
-
-# 图表美化
-ax.set_title(
-    f"测量数据降噪处理对比\n(兴凯湖 {START_DATE} 至 {END_DATE})", pad=20, fontsize=14
-)
-ax.set_xlabel("日期", labelpad=12)
-ax.set_ylabel("测量值", labelpad=12)
-ax.grid(which="major", linestyle="--", alpha=0.7)
-ax.grid(which="minor", linestyle=":", alpha=0.4)
-ax.tick_params(axis="both", which="both", length=4)
-
-# 日期格式化
-ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(ax.xaxis.get_major_locator()))
-
-# 图例优化
-handles, labels = ax.get_legend_handles_labels()
-ax.legend(
-    handles,
-    labels,
-    frameon=False,
-    bbox_to_anchor=(0.18, 0.85),  # 调整垂直位置
-    fontsize=10,
-    handlelength=1.5,
-    handletextpad=0.5,
-)
-
-plt.tight_layout()
-plt.show()
+    return denoise_with_median(series, rolling_median, threshold)
+
+
+# 参数扫描：每个降噪窗口的滑动中位数只计算一次，参数组合并行评估
+def run_sweep(df):
+    result = sweep(
+        df[DATA_COL],
+        SWEEP_THRESHOLDS,
+        SWEEP_WINDOW_SIZES,
+        SWEEP_DENOISE_WINDOWS,
+        START_DATE,
+        END_DATE,
+    )
+    result.to_csv(SWEEP_OUTPUT_PATH, index=False, encoding="utf-8-sig")
+    print(result.iloc[:, :5].to_string(index=False))
+    print(f"参数扫描结果已导出至：{SWEEP_OUTPUT_PATH}")
+
+
+def plot_denoised(df):
+    processed = denoise_data(df[DATA_COL], THRESHOLD)
+
+    # 线性插值填充缺失值后滑动平均，并按天重新采样计算日均值
+    sma, sma_daily = smooth_daily(processed, WINDOW_SIZE)
+
+    # 时间范围筛选
+    df_filtered = df.loc[START_DATE:END_DATE]
+    processed_filtered = processed.loc[START_DATE:END_DATE]
+    sma_filtered = sma.loc[START_DATE:END_DATE]
+    sma_daily_filtered = sma_daily.loc[START_DATE:END_DATE]
+
+    # 导出日均值数据
+    sma_daily_filtered.to_csv(
+        OUTPUT_PATH, index=True, encoding="utf-8-sig"
+    )  # 导出为 CSV 文件
+    print(f"日均值数据已导出至：{OUTPUT_PATH}")
+
+    # 绘图设置
+    plt.figure(figsize=(14, 7), dpi=100)
+    ax = plt.gca()
+
+    # 绘制原始数据（散点图）
+    ax.scatter(
+        df_filtered.index,
+        df_filtered[DATA_COL],
+        color="#D3D3D3",
+        s=10,
+        alpha=0.7,
+        label="原始数据",
+    )
+
+    # 绘制处理数据（散点图）
+    ax.scatter(
+        processed_filtered.index,
+        processed_filtered,
+        color="#FF4500",
+        s=15,
+        label=f"降噪数据（阈值{THRESHOLD*100:.0f}%）",
+    )
+
+    # 绘制滑动平均（折线图，保持为折线以显示趋势）
+    ax.plot(
+        sma_filtered.index,
+        sma_filtered,
+        color="#1E90FF",
+        linewidth=1.5,
+        label=f"滑动平均（{WINDOW_SIZE}分钟窗口）",
+    )
+
+    # 绘制滑动平均的日均值（折线图）
+    ax.plot(
+        sma_daily_filtered.index,
+        sma_daily_filtered,
+        color="#2E8B57",  # 使用绿色表示日均值
+        linewidth=2,
+        linestyle="--",
+        label="滑动平均的日均值",
+    )
+
+    # 纵坐标设置
+    ax.set_ylim(0, 0.5)
+    ax.yaxis.set_major_locator(MultipleLocator(0.1))  # 主刻度每0.1
+    ax.yaxis.set_minor_locator(MultipleLocator(0.02))  # 次刻度每0.02
+    ax.yaxis.set_major_formatter("{x:.2f}")  # 保留两位小数
+
+    # 图表美化
+    ax.set_title(
+        f"测量数据降噪处理对比\n(兴凯湖 {START_DATE} 至 {END_DATE})",
+        pad=20,
+        fontsize=14,
+    )
+    ax.set_xlabel("日期", labelpad=12)
+    ax.set_ylabel("测量值", labelpad=12)
+    ax.grid(which="major", linestyle="--", alpha=0.7)
+    ax.grid(which="minor", linestyle=":", alpha=0.4)
+    ax.tick_params(axis="both", which="both", length=4)
+
+    # 日期格式化
+    ax.xaxis.set_major_formatter(
+        mdates.ConciseDateFormatter(ax.xaxis.get_major_locator())
+    )
+
+    # 图例优化
+    handles, labels = ax.get_legend_handles_labels()
+    ax.legend(
+        handles,
+        labels,
+        frameon=False,
+        bbox_to_anchor=(0.18, 0.85),  # 调整垂直位置
+        fontsize=10,
+        handlelength=1.5,
+        handletextpad=0.5,
+    )
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    df = load_data()
+    if SWEEP_MODE:
+        run_sweep(df)
+    else:
+        plot_denoised(df)